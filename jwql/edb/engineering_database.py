@@ -44,10 +44,13 @@ Notes
     and the datapoint that follows the requested end time.
 """
 import calendar
+import copy
 from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from numbers import Number
 import os
+import threading
 import warnings
 
 from astropy.io import ascii
@@ -55,6 +58,7 @@ from astropy.stats import sigma_clipped_stats
 from astropy.table import Table
 from astropy.time import Time
 import astropy.units as u
+from astropy.utils.exceptions import AstropyUserWarning
 from astroquery.mast import Mast
 from bokeh.embed import components
 from bokeh.layouts import column
@@ -72,6 +76,9 @@ from jwql.utils.utils import get_config
 MAST_EDB_MNEMONIC_SERVICE = 'Mast.JwstEdb.Mnemonics'
 MAST_EDB_DICTIONARY_SERVICE = 'Mast.JwstEdb.Dictionary'
 
+# Engineering database service instances, kept separately for each thread
+ENGDB_SERVICES = threading.local()
+
 if not ON_GITHUB_ACTIONS:
     Mast._portal_api_connection.MAST_REQUEST_URL = get_config()['mast_request_url']
 
@@ -110,35 +117,31 @@ class EdbMnemonic:
             return self
 
         if np.min(self.data["dates"]) < np.min(mnem.data["dates"]):
-            early_dates = self.data["dates"].data
+            early_dates = self.dates
             late_dates = mnem.data["dates"].data
-            early_data = self.data["euvalues"].data
+            early_data = self.values
             late_data = mnem.data["euvalues"].data
             early_blocks = self.blocks
             late_blocks = mnem.blocks
         else:
             early_dates = mnem.data["dates"].data
-            late_dates = self.data["dates"].data
+            late_dates = self.dates
             early_data = mnem.data["euvalues"].data
-            late_data = self.data["euvalues"].data
+            late_data = self.values
             early_blocks = mnem.blocks
             late_blocks = self.blocks
 
         # Remove any duplicates, based on the dates entries
         # Keep track of the indexes of the removed rows, so that any blocks
         # information can be updated
-        all_dates = np.append(early_dates, late_dates)
-        unique_dates, unq_idx = np.unique(all_dates, return_index=True)
-
-        # Combine the data and keep only unique elements
-        all_data = np.append(early_data, late_data)
-        unique_data = all_data[unq_idx]
+        unique_dates, unique_data = merge_sorted_data(early_dates, early_data, late_dates, late_data)
+        num_combined = len(early_dates) + len(late_dates)
 
         # This assumes that if there is overlap between the two date arrays, that
         # the overlap all occurs in a single continuous block at the beginning of
         # the later set of dates. It will not do the right thing if you ask it to
         # (e.g.) interleave two sets of dates.
-        overlap_len = len(unique_dates) - len(all_dates)
+        overlap_len = len(unique_dates) - num_combined
 
         # Shift the block values for the later instance to account for any removed
         # duplicate rows
@@ -158,6 +161,8 @@ class EdbMnemonic:
         new_obj = EdbMnemonic(self.mnemonic_identifier, self.data_start_time, self.data_end_time,
                               new_data, self.meta, self.info, blocks=new_blocks)
 
+        new_obj.change_only = self.change_only or mnem.change_only
+
         if self.mean_time_block is not None:
             new_obj.mean_time_block = self.mean_time_block
         elif mnem.mean_time_block is not None:
@@ -213,6 +218,10 @@ class EdbMnemonic:
         self.requested_end_time = end_time
         self.data = data
 
+        # Cached datetime64 version of the dates column. See the dates64 property.
+        self._dates64 = None
+        self._dates64_column = None
+
         self.mean = []
         self.median = []
         self.stdev = []
@@ -225,6 +234,13 @@ class EdbMnemonic:
         self.info = info
         self.blocks = np.array(blocks)
 
+        # Keep track of whether the data were retrieved from the EDB as change-only
+        # data. This remains True after the data are converted to all-points data.
+        try:
+            self.change_only = self.meta['TlmMnemonics'][0]['AllPoints'] == 0
+        except (KeyError, IndexError, TypeError):
+            self.change_only = False
+
         if len(self.data) == 0:
             self.data_start_time = None
             self.data_end_time = None
@@ -263,13 +279,13 @@ class EdbMnemonic:
             return mnem
 
         # First, interpolate the data in mnem onto the same times as self.data
-        mnem.interpolate(self.data["dates"].data)
+        mnem.interpolate(self.dates)
 
         # Extrapolation will not be done, so make sure that we account for any elements
         # that were removed rather than extrapolated. Find all the dates for which
         # data exists in both instances.
-        common_dates, self_idx, mnem_idx = np.intersect1d(self.data["dates"], mnem.data["dates"],
-                                                          return_indices=True)
+        _, self_idx, mnem_idx = np.intersect1d(self.dates64, mnem.dates64, return_indices=True)
+        common_dates = self.dates[self_idx]
 
         # Adjust self.blocks based on the new dates. For each block, find the index of common_dates
         # that corresponds to its previous date, and use that index in the new blocks list. Note that
@@ -328,6 +344,30 @@ class EdbMnemonic:
             self.mnemonic_identifier, len(self.data), self.data_start_time,
             self.data_end_time)
 
+    @property
+    def dates(self):
+        """Dates of the data, as the plain numpy array underlying the
+        ``dates`` column of ``data``. No copy is made."""
+        return self.data["dates"].data
+
+    @property
+    def dates64(self):
+        """Dates of the data as a ``datetime64[us]`` array. Converting the
+        datetime objects in the ``dates`` column is expensive, so the result is
+        kept and reused until the ``dates`` column (or the whole of ``data``)
+        is replaced."""
+        column = self.data["dates"]
+        if self._dates64_column is not column:
+            self._dates64 = np.asarray(column, dtype='datetime64[us]')
+            self._dates64_column = column
+        return self._dates64
+
+    @property
+    def values(self):
+        """Values of the data, as the plain numpy array underlying the
+        ``euvalues`` column of ``data``. No copy is made."""
+        return self.data["euvalues"].data
+
     def block_stats(self, sigma=3, ignore_vals=[], ignore_edges=False, every_change=False):
         """Calculate stats for a mnemonic where we want a mean value for
         each block of good data, where blocks are separated by times where
@@ -359,12 +399,46 @@ class EdbMnemonic:
         stdevs = []
         medtimes = []
         remove_change_indexes = []
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+        if (type(self.values[0]) not in [np.str_, str] and self.meta['TlmMnemonics'][0]['AllPoints'] != 0
+                and len(ignore_vals) == 0 and not ignore_edges and len(self.blocks) > 1 and None not in self.blocks):
+            # Simple case with nothing to ignore. Place each block into a row of a 2D array, and
+            # calculate the statistics for all blocks at once.
+            # NaNs in the data could not be told apart from the padding, so in that case
+            # fall back to calculating the statistics one block at a time below.
+            blocks = np.asarray(self.blocks, dtype=int)
+            values = np.asarray(self.values, dtype=float)
+            if np.all(blocks[1:] >= blocks[:-1]) and not np.isnan(values).any():
+                binned = pad_bins(values, blocks)
+
+                # Protect against repeated block indexes
+                nonempty = blocks[1:] > blocks[:-1]
+                binned = binned[nonempty]
+                starts = blocks[:-1][nonempty]
+                ends = blocks[1:][nonempty]
+
+                with warnings.catch_warnings():
+                    # The NaN padding of the blocks is reported as invalid input
+                    warnings.simplefilter('ignore', category=AstropyUserWarning)
+                    block_means, block_medians, block_stdevs = sigma_clipped_stats(binned, sigma=sigma, axis=1)
+                block_maxs = np.nanmax(binned, axis=1)
+                block_mins = np.nanmin(binned, axis=1)
+                finite = np.isfinite(block_means)
+
+                dates = self.dates
+                self.mean = list(block_means[finite])
+                self.median = list(block_medians[finite])
+                self.stdev = list(block_stdevs[finite])
+                self.max = list(block_maxs[finite])
+                self.min = list(block_mins[finite])
+                self.median_times = [calc_median_time(dates[start:end]) for start, end in zip(starts[finite], ends[finite])]
+                return
+
+        if type(self.values[0]) not in [np.str_, str]:
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
                     if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                        block = self.data["euvalues"].data[index:self.blocks[i + 1]]
+                        block = self.values[index:self.blocks[i + 1]]
 
                         empty_block = False
                         uvals = np.unique(block)
@@ -404,11 +478,11 @@ class EdbMnemonic:
                             maxval = np.max(block)
                             minval = np.min(block)
                     else:
-                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.data["dates"].data[index:self.blocks[i + 1]],
-                                                                                         self.data["euvalues"].data[index:self.blocks[i + 1]],
+                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.dates[index:self.blocks[i + 1]],
+                                                                                         self.values[index:self.blocks[i + 1]],
                                                                                          sigma=sigma)
                     if np.isfinite(meanval):
-                        medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]]))
+                        medtimes.append(calc_median_time(self.dates[index:self.blocks[i + 1]]))
                         means.append(meanval)
                         medians.append(medianval)
                         maxs.append(maxval)
@@ -430,10 +504,10 @@ class EdbMnemonic:
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
-                    meanval = self.data["euvalues"].data[index]
+                    meanval = self.values[index]
                     medianval = meanval
                     stdevval = 0
-                    medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]]))
+                    medtimes.append(calc_median_time(self.dates[index:self.blocks[i + 1]]))
                     means.append(meanval)
                     medians.append(medianval)
                     stdevs.append(stdevval)
@@ -467,12 +541,12 @@ class EdbMnemonic:
         stdevs = []
         medtimes = []
         remove_change_indexes = []
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+        if type(self.values[0]) not in [np.str_, str]:
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
                     if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                        block = self.data["euvalues"].data[index:self.blocks[i + 1]]
+                        block = self.values[index:self.blocks[i + 1]]
                         filter_value = self.every_change_values[i]
                         pos_type = self.mnemonic_identifier.split('_')[2]
                         if pos_type not in MIRI_POS_RATIO_VALUES:
@@ -506,14 +580,14 @@ class EdbMnemonic:
                             minval = np.min(block)
 
                     else:
-                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.data["dates"].data[index:self.blocks[i + 1]],
-                                                                                         self.data["euvalues"].data[index:self.blocks[i + 1]],
+                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.dates[index:self.blocks[i + 1]],
+                                                                                         self.values[index:self.blocks[i + 1]],
                                                                                          sigma=sigma)
                     if np.isfinite(meanval):
                         # this is preventing the nans above from being added. not sure what to do here.
                         # bokeh cannot deal with nans. but we need entries in order to have the blocks indexes
                         # remain correct. but maybe we dont care about the block indexes after averaging
-                        medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]][good]))
+                        medtimes.append(calc_median_time(self.dates[index:self.blocks[i + 1]][good]))
                         means.append(meanval)
                         medians.append(medianval)
                         maxs.append(maxval)
@@ -532,10 +606,10 @@ class EdbMnemonic:
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
-                    meanval = self.data["euvalues"].data[index]
+                    meanval = self.values[index]
                     medianval = meanval
                     stdevval = 0
-                    medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]]))
+                    medtimes.append(calc_median_time(self.dates[index:self.blocks[i + 1]]))
                     means.append(meanval)
                     medians.append(medianval)
                     stdevs.append(stdevval)
@@ -551,7 +625,8 @@ class EdbMnemonic:
 
     def bokeh_plot(self, show_plot=False, savefig=False, out_dir='./', nominal_value=None, yellow_limits=None,
                    red_limits=None, title=None, xrange=(None, None), yrange=(None, None), return_components=True,
-                   return_fig=False, plot_data=True, plot_mean=False, plot_median=False, plot_max=False, plot_min=False):
+                   return_fig=False, plot_data=True, plot_mean=False, plot_median=False, plot_max=False, plot_min=False,
+                   max_points=None):
         """Make basic bokeh plot showing value as a function of time. Optionally add a line indicating
         nominal (expected) value, as well as yellow and red background regions to denote values that
         may be unexpected.
@@ -613,6 +688,10 @@ class EdbMnemonic:
         plot_min : bool
             If True, also plot the line showing the self.min values
 
+        max_points : int
+            If provided, numeric data in the EdbMnemonic.data table are downsampled to
+            this many points before plotting, using ``lttb_downsample``.
+
         Returns
         -------
         obj : list or bokeh.plotting.figure
@@ -641,7 +720,8 @@ class EdbMnemonic:
             null_vals = [0, 0]
             source = ColumnDataSource(data={'x': null_dates, 'y': null_vals})
         else:
-            source = ColumnDataSource(data={'x': self.data['dates'], 'y': self.data['euvalues']})
+            plot_dates, plot_vals = lttb_downsample(self.dates, self.values, max_points)
+            source = ColumnDataSource(data={'x': plot_dates, 'y': plot_vals})
 
         if savefig:
             filename = os.path.join(out_dir, f"telem_plot_{self.mnemonic_identifier.replace(' ','_')}.html")
@@ -662,7 +742,8 @@ class EdbMnemonic:
                 title = self.mnemonic_identifier
 
         fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type='datetime',
-                     title=title, x_axis_label='Time', y_axis_label=f'{units}')
+                     title=title, x_axis_label='Time', y_axis_label=f'{units}', output_backend='webgl',
+                     lod_threshold=2000)
 
         # For cases where the plot is empty or contains only a single point, force the
         # plot range to something reasonable
@@ -715,20 +796,22 @@ class EdbMnemonic:
                 if plot_min:
                     source_min = ColumnDataSource(data={'min_x': self.median_times, 'min_y': self.min})
                     min_data = fig.scatter(x='min_x', y='min_y', line_width=1, color='black', line_color='black', source=source_min)
-                    minn_hover_tool = HoverTool(tooltips=[('Min', '@min_y'), ('Date', '@min_x{%d %b %Y %H:%M:%S}')],
-                                                mode='mouse', renderers=[min_data])
+                    min_hover_tool = HoverTool(tooltips=[('Min', '@min_y'), ('Date', '@min_x{%d %b %Y %H:%M:%S}')],
+                                               mode='mouse', renderers=[min_data])
                     min_hover_tool.formatters = {'@min_x': 'datetime'}
                     fig.tools.append(min_hover_tool)
 
         if len(self.data["dates"]) == 0:
-            data.visible = False
+            if plot_data:
+                data.visible = False
             if nominal_value is not None:
                 fig.line(null_dates, np.repeat(nominal_value, len(null_dates)), color='black',
                          line_dash='dashed', alpha=0.5)
         else:
             # If there is a nominal value provided, plot a dashed line for it
             if nominal_value is not None:
-                fig.line(self.data['dates'], np.repeat(nominal_value, len(self.data['dates'])), color='black',
+                nominal_dates = [self.dates[0], self.dates[-1]]
+                fig.line(nominal_dates, np.repeat(nominal_value, len(nominal_dates)), color='black',
                          line_dash='dashed', alpha=0.5)
 
         # If limits for warnings/errors are provided, create colored background boxes
@@ -817,14 +900,16 @@ class EdbMnemonic:
         This will help with filtering data based on conditions later, and will create a
         plot that looks more realistic, with only horizontal and vertical lines.
         """
-        new_dates = [self.data["dates"][0]]
-        new_vals = [self.data["euvalues"][0]]
+        dates = self.dates
+        values = self.values
+        new_dates = [dates[0]]
+        new_vals = [values[0]]
         delta_t = timedelta(microseconds=1)
-        for i, row in enumerate(self.data["dates"][1:]):
-            new_dates.append(self.data["dates"][i + 1] - delta_t)
-            new_vals.append(self.data["euvalues"][i])
-            new_dates.append(self.data["dates"][i + 1])
-            new_vals.append(self.data["euvalues"][i + 1])
+        for i in range(1, len(dates)):
+            new_dates.append(dates[i] - delta_t)
+            new_vals.append(values[i - 1])
+            new_dates.append(dates[i])
+            new_vals.append(values[i])
         new_table = Table()
         new_table["dates"] = new_dates
         new_table["euvalues"] = new_vals
@@ -851,33 +936,44 @@ class EdbMnemonic:
             self.max = []
             self.min = []
         else:
-            if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
-                min_date = np.min(self.data["dates"])
-                date_range = np.max(self.data["dates"]) - min_date
-                num_days = date_range.days
-                num_seconds = date_range.seconds
-                range_days = num_days + 1
+            if type(self.values[0]) not in [np.str_, str]:
+                dates = self.dates64
+                values = np.asarray(self.values)
+                order = np.argsort(dates, kind='stable')
+                dates = dates[order]
+                values = values[order]
+
+                min_date = dates[0]
+                range_days = int((dates[-1] - min_date) // np.timedelta64(1, 'D')) + 1
 
                 # Generate a list of times to use as boundaries for calculating means
-                limits = np.array([min_date + timedelta(days=x) for x in range(range_days)])
-                limits = np.append(limits, np.max(self.data["dates"]))
+                limits = min_date + np.arange(range_days) * np.timedelta64(1, 'D')
+                limits = np.append(limits, dates[-1])
 
-                means, meds, devs, maxs, mins, times = [], [], [], [], [], []
-                for i in range(len(limits) - 1):
-                    good = np.where((self.data["dates"] >= limits[i]) & (self.data["dates"] < limits[i + 1]))
+                # Index boundaries of each day within the sorted data
+                idx = np.searchsorted(dates, limits, side='left')
+                times = list((limits[:-1] + (limits[1:] - limits[:-1]) / 2).astype(object))
 
-                    if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                        avg, med, dev = sigma_clipped_stats(self.data["euvalues"][good], sigma=sigma)
-                        maxval = np.max(self.data["euvalues"][good])
-                        minval = np.min(self.data["euvalues"][good])
-                    else:
-                        avg, med, dev, maxval, minval = change_only_stats(self.data["dates"][good], self.data["euvalues"][good], sigma=sigma)
-                    means.append(avg)
-                    meds.append(med)
-                    maxs.append(maxval)
-                    mins.append(minval)
-                    devs.append(dev)
-                    times.append(limits[i] + (limits[i + 1] - limits[i]) / 2.)
+                if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
+                    binned = pad_bins(values.astype(float), idx)
+                    with warnings.catch_warnings():
+                        # The NaN padding of the days is reported as invalid input
+                        warnings.simplefilter('ignore', category=AstropyUserWarning)
+                        warnings.simplefilter('ignore', category=RuntimeWarning)
+                        means, meds, devs = sigma_clipped_stats(binned, sigma=sigma, axis=1)
+                        maxs = np.nanmax(binned, axis=1)
+                        mins = np.nanmin(binned, axis=1)
+                    means, meds, devs, maxs, mins = list(means), list(meds), list(devs), list(maxs), list(mins)
+                else:
+                    date_objs = dates.astype(object)
+                    means, meds, devs, maxs, mins = [], [], [], [], []
+                    for i in range(len(limits) - 1):
+                        avg, med, dev, maxval, minval = change_only_stats(date_objs[idx[i]:idx[i + 1]], values[idx[i]:idx[i + 1]], sigma=sigma)
+                        means.append(avg)
+                        meds.append(med)
+                        maxs.append(maxval)
+                        mins.append(minval)
+                        devs.append(dev)
                 self.mean = means
                 self.median = meds
                 self.stdev = devs
@@ -901,19 +997,19 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use for sigma clipping
         """
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+        if type(self.values[0]) not in [np.str_, str]:
             if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                self.mean, self.median, self.stdev = sigma_clipped_stats(self.data["euvalues"], sigma=sigma)
-                self.max = np.max(self.data["euvalues"])
-                self.min = np.min(self.data["euvalues"])
+                self.mean, self.median, self.stdev = sigma_clipped_stats(self.values, sigma=sigma)
+                self.max = np.max(self.values)
+                self.min = np.min(self.values)
             else:
-                self.mean, self.median, self.stdev, self.max, self.min = change_only_stats(self.data["dates"], self.data["euvalues"], sigma=sigma)
+                self.mean, self.median, self.stdev, self.max, self.min = change_only_stats(self.dates, self.values, sigma=sigma)
             self.mean = [self.mean]
             self.median = [self.median]
             self.stdev = [self.stdev]
             self.max = [self.max]
             self.min = [self.min]
-            self.median_times = [calc_median_time(self.data["dates"])]
+            self.median_times = [calc_median_time(self.dates)]
         else:
             # If the mnemonic values are strings, don't compute statistics
             self.mean = []
@@ -952,31 +1048,28 @@ class EdbMnemonic:
 
         # Change-only data is unique and needs its own way to be interpolated
         if self.meta['TlmMnemonics'][0]['AllPoints'] == 0:
-            new_values = []
-            new_dates = []
-            for time in times:
-                latest = np.where(self.data["dates"] <= time)[0]
-                if len(latest) > 0:
-                    new_values.append(self.data["euvalues"][latest[-1]])
-                    new_dates.append(time)
-            if len(new_values) > 0:
-                new_tab["euvalues"] = np.array(new_values)
-                new_tab["dates"] = np.array(new_dates)
+            # For each requested time, find the latest data point at or before that time.
+            # Times prior to the first data point are ignored.
+            latest = np.searchsorted(self.dates64, np.asarray(times, dtype='datetime64[us]'), side='right') - 1
+            good_times = latest >= 0
+            if np.any(good_times):
+                new_tab["euvalues"] = np.asarray(self.values)[latest[good_times]]
+                new_tab["dates"] = np.asarray(times)[good_times]
 
         # This is for non change-only data
         else:
             # We can only linearly interpolate if we have more than one entry
-            if len(self.data["dates"]) >= 2:
-                interp_times = np.array([create_time_offset(ele, self.data["dates"][0]) for ele in times])
-                mnem_times = np.array([create_time_offset(ele, self.data["dates"][0]) for ele in self.data["dates"]])
+            if len(self.dates) >= 2:
+                interp_times = seconds_since(times, self.dates[0])
+                mnem_times = seconds_since(self.dates64, self.dates[0])
 
                 # Do not extrapolate. Any requested interoplation times that are outside the range
                 # or the original data will be ignored.
                 good_times = ((interp_times >= mnem_times[0]) & (interp_times <= mnem_times[-1]))
                 interp_times = interp_times[good_times]
 
-                new_tab["euvalues"] = np.interp(interp_times, mnem_times, self.data["euvalues"])
-                new_tab["dates"] = np.array([add_time_offset(ele, self.data["dates"][0]) for ele in interp_times])
+                new_tab["euvalues"] = np.interp(interp_times, mnem_times, self.values)
+                new_tab["dates"] = np.asarray(times)[good_times]
 
             else:
                 # If there are not enough data and we are unable to interpolate,
@@ -986,12 +1079,10 @@ class EdbMnemonic:
 
         # Adjust any block values to account for the interpolated data
         new_blocks = []
-        if self.blocks is not None:
-            for index in self.blocks[0:-1]:
-                good = np.where(new_tab["dates"] >= self.data["dates"][index])[0]
-
-                if len(good) > 0:
-                    new_blocks.append(good[0])
+        if self.blocks is not None and len(self.blocks) > 1 and len(new_tab) > 0:
+            block_starts = self.dates64[self.blocks[0:-1].astype(int)]
+            good = np.searchsorted(np.asarray(new_tab["dates"], dtype='datetime64[us]'), block_starts, side='left')
+            new_blocks = list(good[good < len(new_tab)])
 
             # Add en entry for the final element if it's not already there
             if len(new_blocks) > 0:
@@ -1004,7 +1095,7 @@ class EdbMnemonic:
 
     def plot_data_plus_devs(self, use_median=False, show_plot=False, savefig=False, out_dir='./', nominal_value=None, yellow_limits=None,
                             red_limits=None, xrange=(None, None), yrange=(None, None), title=None, return_components=True,
-                            return_fig=False, plot_max=False, plot_min=False):
+                            return_fig=False, plot_max=False, plot_min=False, max_points=None):
         """Make basic bokeh plot showing value as a function of time. Optionally add a line indicating
         nominal (expected) value, as well as yellow and red background regions to denote values that
         may be unexpected. Also add a plot of the mean value over time and in a second figure, a plot of
@@ -1083,8 +1174,7 @@ class EdbMnemonic:
             data_dates = null_dates
             data_vals = null_vals
         else:
-            data_dates = self.data['dates']
-            data_vals = self.data['euvalues']
+            data_dates, data_vals = lttb_downsample(self.dates, self.values, max_points)
         source = ColumnDataSource(data={'x': data_dates, 'y': data_vals})
 
         # yellow and red limits must come in pairs
@@ -1115,7 +1205,7 @@ class EdbMnemonic:
 
         fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type=None,
                      title=title, x_axis_label='Time',
-                     y_axis_label=f'{units}')
+                     y_axis_label=f'{units}', output_backend='webgl', lod_threshold=2000)
 
         # For cases where the plot is empty or contains only a single point, force the
         # plot range to something reasonable
@@ -1157,7 +1247,8 @@ class EdbMnemonic:
         else:
             # If there is a nominal value provided, plot a dashed line for it
             if nominal_value is not None:
-                fig.line(self.data['dates'], np.repeat(nominal_value, len(self.data['dates'])), color='black',
+                nominal_dates = [self.dates[0], self.dates[-1]]
+                fig.line(nominal_dates, np.repeat(nominal_value, len(nominal_dates)), color='black',
                          line_dash='dashed', alpha=0.5)
 
         # If limits for warnings/errors are provided, create colored background boxes
@@ -1183,7 +1274,8 @@ class EdbMnemonic:
 
         # Now create a second plot showing the devitation from the mean
         fig_dev = figure(height=250, x_range=fig.x_range, tools="xpan,xwheel_zoom,xbox_zoom,reset", y_axis_location="left",
-                         x_axis_type='datetime', x_axis_label='Time', y_axis_label=f'Data - Mean ({units})')
+                         x_axis_type='datetime', x_axis_label='Time', y_axis_label=f'Data - Mean ({units})',
+                         output_backend='webgl', lod_threshold=2000)
 
         # Interpolate the mean values so that we can subtract the original data
         if len(self.median_times) > 1:
@@ -1245,37 +1337,46 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use in sigma-clipping
         """
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
-            duration_secs = self.mean_time_block.to('second').value
-            date_arr = np.array(self.data["dates"])
-            num_bins = (np.max(self.data["dates"]) - np.min(self.data["dates"])).total_seconds() / duration_secs
+        if type(self.values[0]) not in [np.str_, str]:
+            duration = np.timedelta64(int(round(self.mean_time_block.to('microsecond').value)), 'us')
+            date_arr = self.dates64
+            values = self.values
+            num_bins = (np.max(date_arr) - np.min(date_arr)) / duration
 
             # Round up to the next integer if there is a fractional number of bins
-            num_bins = np.ceil(num_bins)
+            num_bins = int(np.ceil(num_bins))
 
-            self.mean = []
-            self.median = []
-            self.max = []
-            self.min = []
-            self.stdev = []
-            self.median_times = []
-            for i in range(int(num_bins)):
-                min_date = self.data["dates"][0] + timedelta(seconds=i * duration_secs)
-                max_date = min_date + timedelta(seconds=duration_secs)
-                good = ((date_arr >= min_date) & (date_arr < max_date))
-                if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                    avg, med, dev = sigma_clipped_stats(self.data["euvalues"][good], sigma=sigma)
-                    maxval = np.max(self.data["euvalues"][good])
-                    minval = np.min(self.data["euvalues"][good])
-                else:
-                    avg, med, dev, maxval, minval = change_only_stats(self.data["dates"][good], self.data["euvalues"][good], sigma=sigma)
-                if np.isfinite(avg):
-                    self.mean.append(avg)
-                    self.median.append(med)
-                    self.stdev.append(dev)
-                    self.max.append(maxval)
-                    self.min.append(minval)
-                    self.median_times.append(calc_median_time(self.data["dates"].data[good]))
+            # Bin edges, and the index boundaries of each bin within the data
+            edges = date_arr[0] + np.arange(num_bins + 1) * duration
+            idx = np.searchsorted(date_arr, edges, side='left')
+
+            if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
+                binned = pad_bins(np.asarray(values, dtype=float), idx)
+                with warnings.catch_warnings():
+                    # The NaN padding of the bins is reported as invalid input
+                    warnings.simplefilter('ignore', category=AstropyUserWarning)
+                    warnings.simplefilter('ignore', category=RuntimeWarning)
+                    means, medians, stdevs = sigma_clipped_stats(binned, sigma=sigma, axis=1)
+                    maxs = np.nanmax(binned, axis=1)
+                    mins = np.nanmin(binned, axis=1)
+            else:
+                means, medians, stdevs, maxs, mins = np.full((5, num_bins), np.nan)
+                for i in range(num_bins):
+                    means[i], medians[i], stdevs[i], maxs[i], mins[i] = change_only_stats(self.dates[idx[i]:idx[i + 1]],
+                                                                                          values[idx[i]:idx[i + 1]],
+                                                                                          sigma=sigma)
+
+            # Keep only bins with valid statistics. The median time of each bin is halfway
+            # between the first and last points in the bin.
+            good = np.isfinite(means)
+            first = idx[:-1][good]
+            last = idx[1:][good] - 1
+            self.mean = list(means[good])
+            self.median = list(medians[good])
+            self.stdev = list(stdevs[good])
+            self.max = list(maxs[good])
+            self.min = list(mins[good])
+            self.median_times = list((date_arr[first] + (date_arr[last] - date_arr[first]) / 2).astype(object))
         else:
             self.mean = []
             self.median = []
@@ -1284,6 +1385,71 @@ class EdbMnemonic:
             self.min = []
             self.median_times = []
 
+    def truncate(self, start_time):
+        """Remove data prior to the given time, in order to limit the memory used
+        by long-lived instances. For change-only data, the last point prior to
+        ``start_time`` is kept, since it holds the value in effect at ``start_time``.
+
+        Parameters
+        ----------
+        start_time : datetime.datetime
+            Data prior to this time are removed. ``requested_start_time`` is
+            updated to reflect the new beginning of the data.
+        """
+        if len(self.data) > 0:
+            first = np.searchsorted(self.dates64, np.datetime64(start_time, 'us'), side='left')
+            if self.change_only and first > 0:
+                first -= 1
+
+            if first > 0:
+                self.data = self.data[first:]
+                if self.blocks[0] is not None:
+                    self.blocks = np.unique(np.clip(self.blocks - first, 0, None))
+                if len(self.data) > 0:
+                    self.data_start_time = np.min(self.dates)
+                else:
+                    self.data_start_time = None
+                    self.data_end_time = None
+
+        if self.requested_start_time < start_time:
+            self.requested_start_time = start_time
+
+
+@lru_cache(maxsize=1)
+def _mnemonic_names():
+    """Return the names of all mnemonics in the DMS engineering database,
+    as a set for fast membership tests.
+
+    Returns
+    -------
+    names : frozenset
+        Names (``tlmMnemonic`` values) of all mnemonics
+    """
+    data, _ = _query_mnemonic_inventory()
+    return frozenset(data['tlmMnemonic'])
+
+
+@lru_cache(maxsize=1)
+def _query_mnemonic_inventory():
+    """Query MAST for the inventory of mnemonics in the DMS engineering
+    database. The result is cached, and should not be modified. Use
+    ``mnemonic_inventory`` to get a copy that may be modified.
+
+    Returns
+    -------
+    data : astropy.table.Table
+        Table representation of the mnemonic inventory.
+    meta : dict
+        Additional information returned by the query.
+    """
+    out = Mast.service_request_async(MAST_EDB_MNEMONIC_SERVICE, {})
+    data, meta = process_mast_service_request_result(out)
+
+    # convert numerical ID to str for homogenity (all columns are str)
+    data['tlmIdentifier'] = data['tlmIdentifier'].astype(str)
+
+    return data, meta
+
 
 def add_limit_boxes(fig, yellow=None, red=None):
     """Add green/yellow/red background colors
@@ -1562,6 +1728,41 @@ def create_time_offset(dt_obj, epoch):
         return (dt_obj - epoch).total_seconds()
 
 
+def clear_engdb_services():
+    """Discard the engineering database service instances created by the
+    calling thread, so that the next query creates a new instance. This is
+    used in worker processes, which should not share the connection of the
+    parent process.
+    """
+    ENGDB_SERVICES.services = {}
+
+
+def get_engdb_service(base_url):
+    """Return an engineering database service instance for the given base URL.
+    The instance is created once per thread and then reused for all subsequent
+    queries in that thread, so that the connection to the service can be kept
+    open between queries rather than being re-established for every mnemonic.
+    Service instances keep the state of the query in progress, so they are
+    never shared between threads.
+
+    Parameters
+    ----------
+    base_url : str
+        Base URL of the MAST service
+
+    Returns
+    -------
+    service : jwst.lib.engdb_tools.ENGDB_Service
+        Service instance used to query the engineering database
+    """
+    services = getattr(ENGDB_SERVICES, 'services', None)
+    if services is None:
+        services = ENGDB_SERVICES.services = {}
+    if base_url not in services:
+        services[base_url] = ENGDB_Service(base_url)
+    return services[base_url]
+
+
 def get_mnemonic(mnemonic_identifier, start_time, end_time):
     """Execute query and return an ``EdbMnemonic`` instance.
 
@@ -1586,7 +1787,7 @@ def get_mnemonic(mnemonic_identifier, start_time, end_time):
         EdbMnemonic object containing query results
     """
     base_url = get_mast_base_url()
-    service = ENGDB_Service(base_url)  # By default, will use the public MAST service.
+    service = get_engdb_service(base_url)  # By default, will use the public MAST service.
 
     meta = service.get_meta(mnemonic_identifier)
 
@@ -1700,8 +1901,8 @@ def interpolate_datetimes(new_times, old_times, old_data):
     """
     # We can only linearly interpolate if we have more than one entry
     if len(old_data) >= 2:
-        interp_times = np.array([create_time_offset(ele, old_times[0]) for ele in new_times])
-        mnem_times = np.array([create_time_offset(ele, old_times[0]) for ele in old_times])
+        interp_times = seconds_since(new_times, old_times[0])
+        mnem_times = seconds_since(old_times, old_times[0])
         new_data = np.interp(interp_times, mnem_times, old_data)
     else:
         # If there are not enough data and we are unable to interpolate,
@@ -1723,18 +1924,71 @@ def is_valid_mnemonic(mnemonic_identifier):
     bool
         Is mnemonic_identifier a valid EDB mnemonic?
     """
-    inventory = mnemonic_inventory()[0]
-    if mnemonic_identifier in inventory['tlmMnemonic']:
-        return True
-    else:
-        return False
+    return mnemonic_identifier in _mnemonic_names()
+
+
+def lttb_downsample(dates, values, max_points):
+    """Downsample a time series for plotting using the Largest-Triangle-Three-Buckets
+    algorithm. The first and last points are always kept. The remaining points are
+    divided into equal-sized buckets, and from each bucket the point forming the
+    largest triangle with the previously selected point and the average of the next
+    bucket is kept. This preserves the visual shape of the data, including spikes.
+
+    Parameters
+    ----------
+    dates : numpy.ndarray
+        Array of datetime objects
+
+    values : numpy.ndarray
+        Array of data values associated with ``dates``
+
+    max_points : int
+        Maximum number of points to keep. If None, or if the data are not numeric,
+        the inputs are returned unchanged.
+
+    Returns
+    -------
+    dates : numpy.ndarray
+        Downsampled dates
+
+    values : numpy.ndarray
+        Downsampled data values
+    """
+    num_points = len(dates)
+    if max_points is None or num_points <= max_points or max_points < 3 or not isinstance(values[0], Number):
+        return dates, values
+
+    dates = np.asarray(dates)
+    values = np.asarray(values)
+    xvals = seconds_since(dates, dates[0])
+    yvals = values.astype(float)
+
+    # Boundaries of the buckets holding all points other than the first and last
+    edges = np.linspace(1, num_points - 1, max_points - 1).astype(int)
+    keep = np.zeros(max_points, dtype=int)
+    keep[-1] = num_points - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = xvals[stop:edges[i + 2]].mean()
+            next_y = yvals[stop:edges[i + 2]].mean()
+        else:
+            next_x = xvals[-1]
+            next_y = yvals[-1]
+        area = np.abs((xvals[previous] - next_x) * (yvals[start:stop] - yvals[previous])
+                      - (xvals[previous] - xvals[start:stop]) * (next_y - yvals[previous]))
+        previous = start + np.argmax(area)
+        keep[i + 1] = previous
+    return dates[keep], values[keep]
 
 
 def mnemonic_inventory():
     """Return all mnemonics in the DMS engineering database.
     No authentication is required, this information is public.
     Since this is a rather large and quasi-static table (~15000 rows),
-    it is cached using functools.
+    it is cached using functools. A copy of the cached table is
+    returned, so callers are free to modify it.
 
     Returns
     -------
@@ -1743,13 +1997,172 @@ def mnemonic_inventory():
     meta : dict
         Additional information returned by the query.
     """
-    out = Mast.service_request_async(MAST_EDB_MNEMONIC_SERVICE, {})
-    data, meta = process_mast_service_request_result(out)
+    data, meta = _query_mnemonic_inventory()
+    return data.copy(), copy.deepcopy(meta)
 
-    # convert numerical ID to str for homogenity (all columns are str)
-    data['tlmIdentifier'] = data['tlmIdentifier'].astype(str)
 
-    return data, meta
+def merge_sorted_data(early_dates, early_data, late_dates, late_data):
+    """Combine two sets of dates and data values, removing entries with
+    duplicate dates. When both sets of dates are strictly increasing (as
+    is the case for EDB query results), the sets are merged with a single
+    binary search, without re-sorting. Otherwise, the sets are combined and
+    sorted. For duplicate dates, the value from the early set is kept.
+
+    Parameters
+    ----------
+    early_dates : numpy.ndarray
+        Dates of the first set of data
+
+    early_data : numpy.ndarray
+        Values of the first set of data
+
+    late_dates : numpy.ndarray
+        Dates of the second set of data
+
+    late_data : numpy.ndarray
+        Values of the second set of data
+
+    Returns
+    -------
+    dates : numpy.ndarray
+        Sorted, unique dates
+
+    data : numpy.ndarray
+        Values corresponding to ``dates``
+    """
+    early_dates = np.asarray(early_dates)
+    late_dates = np.asarray(late_dates)
+    early_data = np.asarray(early_data)
+    late_data = np.asarray(late_data)
+
+    if not (np.all(early_dates[1:] > early_dates[:-1]) and np.all(late_dates[1:] > late_dates[:-1])):
+        all_dates = np.append(early_dates, late_dates)
+        unique_dates, unq_idx = np.unique(all_dates, return_index=True)
+        return unique_dates, np.append(early_data, late_data)[unq_idx]
+
+    # Position in the early dates at which each late date belongs, and whether
+    # the late date is already present in the early dates
+    idx = np.searchsorted(early_dates, late_dates, side='left')
+    dup = idx < len(early_dates)
+    dup[dup] = early_dates[idx[dup]] == late_dates[dup]
+    keep = ~dup
+    kept_idx = idx[keep]
+
+    # Final positions of the elements of each set in the merged arrays
+    late_pos = kept_idx + np.arange(len(kept_idx))
+    early_pos = np.arange(len(early_dates)) + np.searchsorted(kept_idx, np.arange(len(early_dates)), side='right')
+
+    total = len(early_dates) + len(kept_idx)
+    dates = np.empty(total, dtype=np.concatenate((early_dates[:0], late_dates[:0])).dtype)
+    data = np.empty(total, dtype=np.concatenate((early_data[:0], late_data[:0])).dtype)
+    dates[early_pos] = early_dates
+    dates[late_pos] = late_dates[keep]
+    data[early_pos] = early_data
+    data[late_pos] = late_data[keep]
+    return dates, data
+
+
+def pad_bins(values, bin_indexes):
+    """Place the contents of each bin into a row of a 2D array, padded
+    with NaNs, so that statistics for all bins can be calculated with
+    a single call along ``axis=1``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        1D array of data values, sorted such that each bin is contiguous
+
+    bin_indexes : numpy.ndarray
+        Indexes into ``values`` of the bin boundaries (e.g. from
+        ``np.searchsorted``). Bin ``i`` is ``values[bin_indexes[i]:bin_indexes[i + 1]]``
+
+    Returns
+    -------
+    binned : numpy.ndarray
+        2D array with one row per bin. Unused elements are NaN.
+    """
+    bin_indexes = np.asarray(bin_indexes)
+    counts = np.diff(bin_indexes)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    cols = np.arange(bin_indexes[0], bin_indexes[-1]) - np.repeat(bin_indexes[:-1], counts)
+    binned = np.full((len(counts), max(counts.max(initial=0), 1)), np.nan)
+    binned[rows, cols] = values[bin_indexes[0]:bin_indexes[-1]]
+    return binned
+
+
+def seconds_since(times, epoch):
+    """Vectorized version of ``create_time_offset``. Return the number of
+    seconds between each of the input times and the epoch.
+
+    Parameters
+    ----------
+    times : list or numpy.ndarray
+        Datetime objects or numpy.datetime64 values
+
+    epoch : datetime.datetime or numpy.datetime64
+        Time to be subtracted from ``times``
+
+    Returns
+    -------
+    offsets : numpy.ndarray
+        Number of seconds between each element of ``times`` and ``epoch``
+    """
+    times = np.asarray(times, dtype='datetime64[us]')
+    return (times - np.datetime64(epoch, 'us')) / np.timedelta64(1, 's')
+
+
+def sigma_clipped_bin_stats(binned, sigma=3, maxiters=5):
+    """Calculate the sigma-clipped mean, median, and standard deviation
+    of each row in a NaN-padded 2D array (e.g. from ``pad_bins``). Clipping
+    is done about the mean, all rows at once, and stops as soon as an
+    iteration rejects no additional points.
+
+    Parameters
+    ----------
+    binned : numpy.ndarray
+        2D array with one row per bin. NaN elements are ignored
+
+    sigma : float
+        Number of standard deviations to use for clipping
+
+    maxiters : int
+        Maximum number of clipping iterations
+
+    Returns
+    -------
+    means : numpy.ndarray
+        Sigma-clipped mean of each row
+
+    medians : numpy.ndarray
+        Sigma-clipped median of each row
+
+    stdevs : numpy.ndarray
+        Sigma-clipped standard deviation of each row
+    """
+    clipped = np.array(binned, dtype=float)
+
+    # Work arrays are allocated once and reused on every iteration
+    deviation = np.empty_like(clipped)
+    reject = np.empty(clipped.shape, dtype=bool)
+    with warnings.catch_warnings():
+        # Rows that are entirely NaN (i.e. empty bins) produce NaN statistics
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for _ in range(maxiters):
+            means = np.nanmean(clipped, axis=1, keepdims=True)
+            stdevs = np.nanstd(clipped, axis=1, keepdims=True)
+            np.subtract(clipped, means, out=deviation)
+            np.abs(deviation, out=deviation)
+            stdevs *= sigma
+            # Points already clipped are NaN, and so are never rejected again
+            np.greater(deviation, stdevs, out=reject)
+            if not reject.any():
+                break
+            clipped[reject] = np.nan
+
+        means = np.nanmean(clipped, axis=1)
+        medians = np.nanmedian(clipped, axis=1)
+        stdevs = np.nanstd(clipped, axis=1)
+    return means, medians, stdevs
 
 
 def process_mast_service_request_result(result, data_as_table=True):
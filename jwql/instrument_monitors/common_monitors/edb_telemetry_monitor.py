@@ -365,16 +365,18 @@ Use
 """
 import argparse
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from copy import deepcopy
 import datetime
+import hashlib
 import json
 import logging
 import numpy as np
 import os
 from requests.exceptions import HTTPError
+import threading
 import urllib
 
-from astropy.stats import sigma_clipped_stats
 from astropy.table import Table
 from astropy.time import Time, TimeDelta
 import astropy.units as u
@@ -384,6 +386,7 @@ from bokeh.models import BoxAnnotation, ColumnDataSource, DatetimeTickFormatter,
 from bokeh.models.layouts import Tabs
 from bokeh.plotting import figure, output_file, save, show
 from bokeh.palettes import Turbo256
+from sqlalchemy import func
 from jwql.database import database_interface
 from jwql.database.database_interface import NIRCamEDBDailyStats, NIRCamEDBBlockStats, \
     NIRCamEDBTimeIntervalStats, NIRCamEDBEveryChangeStats, NIRISSEDBDailyStats, NIRISSEDBBlockStats, \
@@ -397,7 +400,7 @@ from jwql.instrument_monitors.common_monitors.edb_telemetry_monitor_utils import
 from jwql.shared_tasks.shared_tasks import only_one
 from jwql.utils import monitor_utils
 from jwql.utils.logging_functions import log_info, log_fail
-from jwql.utils.constants import EDB_DEFAULT_PLOT_RANGE, JWST_INSTRUMENT_NAMES, JWST_INSTRUMENT_NAMES_MIXEDCASE, MIRI_POS_RATIO_VALUES
+from jwql.utils.constants import EDB_DEFAULT_PLOT_RANGE, EDB_MAX_PLOT_POINTS, JWST_INSTRUMENT_NAMES, JWST_INSTRUMENT_NAMES_MIXEDCASE, MIRI_POS_RATIO_VALUES
 from jwql.utils.permissions import set_permissions
 from jwql.utils.utils import ensure_dir_exists, get_config
 
@@ -420,6 +423,14 @@ class EdbMnemonicMonitor():
     query_results : dict
         Dictionary containing EDB query results for all mnemonics for the current session.
 
+    cache_dir : str
+        Directory containing on-disk copies of dependency mnemonic query results, which
+        persist between sessions. If None, no on-disk caching is done.
+
+    workers : int
+        Number of worker processes used to query, filter, and average the data for
+        different mnemonics in parallel. If 1, mnemonics are processed serially.
+
     figures : dict
         Dictionary of Bokeh figures. Keys are the plot_category, and values are lists of
         Bokeh figure objects.
@@ -476,6 +487,11 @@ class EdbMnemonicMonitor():
     """
     def __init__(self):
         self.query_results = {}
+        self.cache_dir = None
+        self.workers = 1
+        self._latest_queries = None
+        self._pending_queries = {}
+        self._prefetch_executor = None
 
     def add_figure(self, fig, key):
         """Add Bokeh figure to the dictionary of figures
@@ -549,8 +565,10 @@ class EdbMnemonicMonitor():
             Start time of the query
         """
         # We create a separate database entry for each unique value of the
-        # dependency mnemonic.
+        # dependency mnemonic. All entries are inserted with a single statement.
         logging.info(f"Adding new entries for {mnem} to history table.")
+        db_entries = []
+        entry_date = datetime.datetime.now()
         for key, value in mnem_dict.items():
             (times, values, medians, stdevs) = value
             times = ensure_list(times)
@@ -564,11 +582,13 @@ class EdbMnemonicMonitor():
                         'median': medians,
                         'stdev': stdevs,
                         'latest_query': query_time,
-                        'entry_date': datetime.datetime.now()
+                        'entry_date': entry_date
                         }
+            db_entries.append(db_entry)
+
+        if len(db_entries) > 0:
             with engine.begin() as connection:
-                connection.execute(
-                    self.history_table.__table__.insert(), db_entry)
+                connection.execute(self.history_table.__table__.insert(), db_entries)
 
     def calc_timed_stats(self, mnem_data, bintime, sigma=3):
         """Not currently used.
@@ -579,6 +599,11 @@ class EdbMnemonicMonitor():
         time and ignore any missing data due to filtering? The former
         makes more sense to me
 
+        Within each block, the data are sorted by time once and the bin
+        edges are located with ``np.searchsorted``. The bins are then
+        packed into a NaN-padded 2D array so that the sigma-clipping is
+        done for all bins of a block at once, rather than once per bin.
+
         Parameters
         ----------
         mnem_data : jwql.edb.engineering_database.EdbMnemonic
@@ -587,44 +612,124 @@ class EdbMnemonicMonitor():
         bintime : astropy.time.Quantity
             Time to use for binning and averaging data
 
+        sigma : float
+            Number of standard deviations to use for sigma-clipping
+
         Returns
         -------
-        all_means : list
-            List of mean values
+        all_means : numpy.ndarray
+            Array of mean values
 
-        all_meds : list
-            List of median values
+        all_meds : numpy.ndarray
+            Array of median values
 
-        all_stdevs : list
-            List of stadnard deviations
+        all_stdevs : numpy.ndarray
+            Array of stadnard deviations
 
-        all_times : list
-            List of times associated with the means, medians, and standard deviations
+        all_times : numpy.ndarray
+            Array of times (numpy.datetime64) associated with the means, medians, and
+            standard deviations
         """
-        all_means = []
-        all_meds = []
-        all_stdevs = []
-        all_times = []
-
-        minimal_delta = 1 * u.sec  # modify based on units of time
+        dates = np.array(mnem_data.dates, dtype='datetime64[us]')
+        values = np.asarray(mnem_data.values, dtype=float)
+        bin_delta = np.timedelta64(int(bintime.to(u.microsecond).value), 'us')
+        minimal_delta = np.timedelta64(1, 's')
+
+        # Sort each block and define its bins first, so that the total number of
+        # bins is known and the output arrays can be allocated once.
+        block_bins = []
         for i in range(len(mnem_data.blocks) - 1):
-            block_min_time = mnem_data.data["dates"][mnem_data.blocks[i]]
-            block_max_time = mnem_data.data["dates"][mnem_data.blocks[i + 1]]
-            bin_times = np.arange(block_min_time, block_max_time + minimal_delta, bintime)
-            all_times.extend((bin_times[1:] - bin_times[0:-1]) / 2.)  # for plotting later
-
-            for b_idx in range(len(bin_times) - 1):
-                good_points = np.where((mnem_data.data["dates"] >= bin_times[b_idx]) & (mnem_data.data["dates"] < bin_times[b_idx + 1]))
-                bin_mean, bin_med, bin_stdev = sigma_clipped_stats(mnem_data.data["data"][good_points], sigma=sigma)
-                all_means.append(bin_mean)
-                all_meds.append(bin_med)
-                all_stdevs.append(bin_stdev)
+            block_dates = dates[mnem_data.blocks[i]:mnem_data.blocks[i + 1]]
+            block_values = values[mnem_data.blocks[i]:mnem_data.blocks[i + 1]]
+            if len(block_dates) == 0:
+                continue
+
+            order = np.argsort(block_dates, kind='stable')
+            block_dates = block_dates[order]
+            block_values = block_values[order]
+
+            bin_times = np.arange(block_dates[0], block_dates[-1] + minimal_delta, bin_delta)
+            if len(bin_times) < 2:
+                continue
+            block_bins.append((block_dates, block_values, bin_times))
+
+        total_bins = sum(len(bin_times) - 1 for _, _, bin_times in block_bins)
+        all_means = np.empty(total_bins)
+        all_meds = np.empty(total_bins)
+        all_stdevs = np.empty(total_bins)
+        all_times = np.empty(total_bins, dtype='datetime64[us]')
+
+        start = 0
+        for block_dates, block_values, bin_times in block_bins:
+            end = start + len(bin_times) - 1
+            all_times[start:end] = bin_times[:-1] + (bin_times[1:] - bin_times[:-1]) / 2  # for plotting later
+
+            # Index boundaries of each bin within the sorted block
+            idx = np.searchsorted(block_dates, bin_times, side='left')
+            buf = ed.pad_bins(block_values, idx)
+
+            # Clip about the mean rather than the median. The median is then only
+            # computed once, on the clipped data, rather than on every iteration.
+            all_means[start:end], all_meds[start:end], all_stdevs[start:end] = ed.sigma_clipped_bin_stats(buf, sigma=sigma)
+            start = end
         return all_means, all_meds, all_stdevs, all_times
 
+    def conditioned_cache_file(self, mnemonic, starttime, endtime, telemetry_type):
+        """Return the name of the on-disk cache file holding the filtered data for a mnemonic
+        over a given time range. The file name is a hash of the mnemonic name, the time range,
+        and the dependency conditions, so that any change in these results in a new file.
+
+        Parameters
+        ----------
+        mnemonic : dict
+            Dictionary of information about the mnemonic, as read in from the json file
+            of mnemonics to be monitored
+
+        starttime : datetime.datetime
+            Beginning time of the data
+
+        endtime : datetime.datetime
+            Ending time of the data
+
+        telemetry_type : str
+            How the telemetry will be processed. e.g. "daily_means", "every_change"
+
+        Returns
+        -------
+        cache_file : str
+            Name of the cache file. None if the filtered data should not be cached.
+        """
+        if self.cache_dir is None or telemetry_type == "every_change":
+            return None
+
+        # Data close to the present may still be incomplete in the EDB, so only cache
+        # time ranges that ended more than a day ago
+        if endtime > datetime.datetime.now() - datetime.timedelta(days=1):
+            return None
+
+        key_str = f'{mnemonic["name"]}|{mnemonic.get("database_id", "")}|{starttime}|{endtime}|' \
+                  f'{json.dumps(mnemonic["dependency"], sort_keys=True)}'
+        key = hashlib.blake2b(key_str.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, 'conditioned', mnemonic["name"], f'{key}.npz')
+
+    def evict_query_results(self, start_time):
+        """Remove data prior to the given time from all entries in ``self.query_results``.
+        Mnemonics are processed one day at a time in increasing time order, so data
+        from earlier days will not be needed again. This keeps the memory used by
+        ``self.query_results`` from growing without bound over a long session.
+
+        Parameters
+        ----------
+        start_time : datetime.datetime
+            Data prior to this time are removed
+        """
+        for saved in self.query_results.values():
+            saved.truncate(start_time)
+
     @log_fail
     @log_info
     @only_one(key='edb_monitor')
-    def execute(self, mnem_to_query=None, plot_start=None, plot_end=None):
+    def execute(self, mnem_to_query=None, plot_start=None, plot_end=None, workers=1):
         """Top-level wrapper to run the monitor. Take a requested list of mnemonics to
         process, or assume that mnemonics will be processed.
 
@@ -646,7 +751,12 @@ class EdbMnemonicMonitor():
 
         plot_end : datetime.datetime
             End time to use for the query when requested from the website.
+
+        workers : int
+            Number of worker processes used to process mnemonics in parallel
         """
+        self.workers = workers
+
         # This is a dictionary that will hold the query results for multiple mnemonics,
         # in an effort to minimize the number of EDB queries and save time.
         self.query_results = {}
@@ -663,6 +773,10 @@ class EdbMnemonicMonitor():
         outputs_dir = os.path.join(config["outputs"], "edb_telemetry_monitor")
         ensure_dir_exists(outputs_dir)
 
+        # Directory holding cached EDB query results for dependency mnemonics
+        self.cache_dir = os.path.join(outputs_dir, "edb_cache")
+        ensure_dir_exists(self.cache_dir)
+
         # Case where the user is requesting the monitor run for some subset of
         # mnemonics for some non-standard time span
         if mnem_to_query is not None:
@@ -745,7 +859,8 @@ class EdbMnemonicMonitor():
         Returns
         -------
         filtered : jwql.edb.engineering_database.EdbMnemonic
-            Filtered information and query results for a single mnemonic
+            Filtered information and query results for a single mnemonic. None if
+            no data meet all of the conditions.
         """
         if len(dep_list) == 0:
             return data
@@ -762,8 +877,8 @@ class EdbMnemonicMonitor():
                 # If we are just filtering the mnemonic based on it's own values, then there is
                 # no need to query the EDB
                 dep_mnemonic = {}
-                dep_mnemonic["dates"] = data.data["dates"]
-                dep_mnemonic["euvalues"] = data.data["euvalues"]
+                dep_mnemonic["dates"] = data.dates
+                dep_mnemonic["euvalues"] = data.values
 
             if len(dep_mnemonic["dates"]) > 0:
                 # For each dependency, get a list of times where the data are considered good
@@ -799,13 +914,18 @@ class EdbMnemonicMonitor():
             # To do this we use interpolate, but afterwards the data will still be change-
             # only.
             if None not in boundary_times:
-                existing_dates = np.array(data.data["dates"])
+                existing_dates = data.dates
                 unique_boundary_dates = np.unique(np.array(boundary_times))
                 interp_dates = sorted(np.append(existing_dates, unique_boundary_dates))
                 data.interpolate(interp_dates)
 
         full_condition.extract_data(data.data)
 
+        # If no data satisfy all of the conditions, there is nothing more to do
+        if len(full_condition.extracted_data["dates"]) == 0:
+            logging.info(f'No {mnem} data between {data.requested_start_time} and {data.requested_end_time} meet all conditions.')
+            return None
+
         # Put the results into an instance of EdbMnemonic
         filtered = ed.EdbMnemonic(data.mnemonic_identifier, data.requested_start_time, data.requested_end_time,
                                   full_condition.extracted_data, data.meta, data.info, blocks=full_condition.block_indexes)
@@ -852,49 +972,45 @@ class EdbMnemonicMonitor():
         # of data to a single block. Since filter_data is called before find_all_changes, we
         # *should* never end up in here, as missing dependency data should zero out the main
         # mnemonic in there.
-        if len(dependency) == 0:
-            mnem_data.blocks = [0, len(mnem)]
+        if len(dependency["dates"]) == 0:
+            mnem_data.blocks = [0, len(mnem_data)]
             mnem_data.every_change_values = [np.nan]
+            return mnem_data
 
         # Make sure the data values for the dependency are strings.
         if type(dependency["euvalues"][0]) != np.str_:
             raise NotImplementedError("find_all_changes() is not set up to handle non-strings in the dependency data")
         else:
             # Find indexes within the data table where the value of the dependency changes.
-            change_indexes = np.where(dependency["euvalues"][:-1] != dependency["euvalues"][1:])[0]
-
-            # Increase values by 1 to get the correct index for the full data length
-            if len(change_indexes) > 0:
-                change_indexes += 1
-
-            # Add 0 as the first element
-            change_indexes = np.insert(change_indexes, 0, 0)
-
-            # Add the largest index as the final element
-            change_indexes = np.insert(change_indexes, len(change_indexes), len(dependency["euvalues"]))
+            # Increase values by 1 to get the correct index for the full data length, and
+            # bracket with 0 and the largest index, so that consecutive pairs of indexes
+            # partition the data into blocks.
+            dep_values = np.asarray(dependency["euvalues"])
+            change_indexes = np.flatnonzero(dep_values[:-1] != dep_values[1:]) + 1
+            change_indexes = np.concatenate(([0], change_indexes, [len(dep_values)]))
 
             # If dates differ between the mnemonic of interest and the dependency, then interpolate to match
             # If the mnemonic of interest is change-only data, then we need to interpolate onto a list of dates
             # that include those originally in the mnemonic plus those in the dependency)
-            if (len(dependency["dates"]) != len(mnem_data.data["dates"].value)) or not np.all(dependency["dates"] == mnem_data.data["dates"].value):
+            if (len(dependency["dates"]) != len(mnem_data.dates)) or not np.all(dependency["dates"] == mnem_data.dates):
                 if mnem_data.meta['TlmMnemonics'][0]['AllPoints'] != 0:
                     mnem_data.interpolate(dependency["dates"])
                 else:
                     # In practice, we should never end up in this block, because change-only data are transformed
                     # into every-point data after being returned by the query. It might be useful to keep this
                     # here for now, in case that situation changes later.
-                    all_dates = sorted(np.append(np.array(dependency["dates"]), np.array(mnem_data.data["dates"].data)))
+                    all_dates = sorted(np.append(dependency["dates"], mnem_data.dates))
                     mnem_data.interpolate(all_dates)
 
                     # We also need to interpolate the dependency onto the same dates here, so that we know
                     # the new indexes where the values change
                     temp_dep = ed.EdbMnemonic(dep_list[0]['name'], dependency["dates"][0], dependency["dates"][-1],
-                                              dependency, meta={'TlmMnemonics': [{'AllPoints': 1}]}, info={}, blocks=change_indexes)
+                                              Table(dependency), meta={'TlmMnemonics': [{'AllPoints': 1}]}, info={}, blocks=change_indexes)
                     temp_dep.interpolate(all_dates)
                     change_indexes = temp_dep.blocks
 
             # Get the dependency values for each change.
-            vals = dependency["euvalues"][change_indexes[0:-1]].data
+            vals = dependency["euvalues"][change_indexes[0:-1]]
 
             # Place the dependency values in the every_change_values attribute, and the corresponding
             # indexes where the changes happen into the blocks attribute.
@@ -927,8 +1043,6 @@ class EdbMnemonicMonitor():
             query_ending_times = None
             logging.info(f'Query start times: None')
         else:
-            query_starting_times = []
-            query_ending_times = []
             dtime = self._plot_end - starting_time
             if dtime > self.query_duration:
                 full_days = dtime.days
@@ -943,23 +1057,18 @@ class EdbMnemonicMonitor():
                 # The next run of the monitor will be used to cover that time.
                 return None, None
 
-            for delta in range(full_days):
-                tmp_start = starting_time + datetime.timedelta(days=delta)
-                query_starting_times.append(tmp_start)
-                query_ending_times.append(tmp_start + self.query_duration)
+            # Start times are once per day, beginning at starting_time
+            day_starts = np.datetime64(starting_time, 'us') + np.arange(full_days) * np.timedelta64(1, 'D')
+            day_ends = day_starts + np.timedelta64(self.query_duration, 'us')
 
             # Make sure the end time of the final query is before the current time.
-            # If it is after the present time, remove start,end pairs until the
-            # latest ending time is before the present. It's better to throw out
-            # the entire start,end entry rather than shorten the final start,end
-            # pair because that can potentially cause a block of time to be skipped
-            # over on the next run of the monitor.
-            if query_ending_times[-1] > self._today:
-                query_ending_times = np.array(query_ending_times)
-                query_starting_times = np.array(query_starting_times)
-                valid_ending_times = query_ending_times <= self._today
-                query_starting_times = query_starting_times[valid_ending_times]
-                query_ending_times = query_ending_times[valid_ending_times]
+            # Remove any start,end pairs where the ending time is after the present.
+            # It's better to throw out the entire start,end entry rather than shorten
+            # the final start,end pair because that can potentially cause a block of
+            # time to be skipped over on the next run of the monitor.
+            valid_ending_times = day_ends <= np.datetime64(self._today, 'us')
+            query_starting_times = day_starts[valid_ending_times].tolist()
+            query_ending_times = day_ends[valid_ending_times].tolist()
         return query_starting_times, query_ending_times
 
     def get_dependency_data(self, dependency, starttime, endtime):
@@ -983,8 +1092,9 @@ class EdbMnemonicMonitor():
         Returns
         -------
         dep_mnemonic : dict
-            Data for the dependency mnemonic. Keys are "dates" and "euvalues". This is
-            essentially the data in the ```data``` attribute of an EDBMnemonic instance
+            Data for the dependency mnemonic. Keys are "dates" and "euvalues", and values
+            are numpy arrays. This is essentially the data in the ```dates``` and ```values```
+            attributes of an EDBMnemonic instance
         """
         # If we have already queried the EDB for the dependency's data in the time
         # range of interest, then use that data rather than re-querying.
@@ -996,21 +1106,23 @@ class EdbMnemonicMonitor():
 
                 logging.info(f'Dependency {dependency["name"]} is already present in self.query_results.')
 
-                # Extract data for the requested time range
-                matching_times = np.where((self.query_results[dependency["name"]].data["dates"] >= starttime)
-                                        & (self.query_results[dependency["name"]].data["dates"] <= endtime))
-                dep_mnemonic = {"dates": self.query_results[dependency["name"]].data["dates"][matching_times],
-                                "euvalues": self.query_results[dependency["name"]].data["euvalues"][matching_times]}
+                # Extract data for the requested time range. Query results are sorted by
+                # date, so the range is a contiguous slice.
+                saved_dates = self.query_results[dependency["name"]].dates
+                first = np.searchsorted(saved_dates, starttime, side='left')
+                last = np.searchsorted(saved_dates, endtime, side='right')
+                dep_mnemonic = {"dates": saved_dates[first:last],
+                                "euvalues": self.query_results[dependency["name"]].values[first:last]}
 
                 logging.info(f'Length of returned data: {len(dep_mnemonic["dates"])}')
             else:
                 # If what we have from previous queries doesn't cover the time range we need, then query the EDB.
                 logging.info(f'Dependency {dependency["name"]} is present in self.query results, but does not cover the needed time. Querying EDB for the dependency.')
-                mnemonic_data = ed.get_mnemonic(dependency["name"], starttime, endtime)
+                mnemonic_data = self.get_mnemonic_cached(dependency["name"], starttime, endtime)
                 logging.info(f'Length of returned data: {len(mnemonic_data)}, {starttime}, {endtime}')
 
                 # Place the data in a dictionary
-                dep_mnemonic = {"dates": mnemonic_data.data["dates"], "euvalues": mnemonic_data.data["euvalues"]}
+                dep_mnemonic = {"dates": mnemonic_data.dates, "euvalues": mnemonic_data.values}
 
                 # This is to save the data so that we may avoid an EDB query next time
                 # Add the new data to the saved query results. This should also filter out
@@ -1020,14 +1132,82 @@ class EdbMnemonicMonitor():
             # In this case, the dependency is not present at all in the dictionary of past query results.
             # So here we again have to query the EDB.
             logging.info(f'Dependency {dependency["name"]} is not in self.query_results. Querying the EDB.')
-            self.query_results[dependency["name"]] = ed.get_mnemonic(dependency["name"], starttime, endtime)
+            self.query_results[dependency["name"]] = self.get_mnemonic_cached(dependency["name"], starttime, endtime)
             logging.info(f'Length of data: {len(self.query_results[dependency["name"]])}, {starttime}, {endtime}')
 
-            dep_mnemonic = {"dates": self.query_results[dependency["name"]].data["dates"],
-                            "euvalues": self.query_results[dependency["name"]].data["euvalues"]}
+            dep_mnemonic = {"dates": self.query_results[dependency["name"]].dates,
+                            "euvalues": self.query_results[dependency["name"]].values}
 
         return dep_mnemonic
 
+    def get_filtered_data(self, mnemonic, starting_time, ending_time, telemetry_type):
+        """Query the EDB for a single mnemonic and filter the result based on the
+        mnemonic's dependencies.
+
+        Parameters
+        ----------
+        mnemonic : dict
+            Dictionary of information about the mnemonic to be processed. Dictionary
+            as read in from the json file of mnemonics to be monitored.
+
+        starting_time : datetime.datetime
+            Beginning time for query
+
+        ending_time : datetime.datetime
+            Ending time for query
+
+        telemetry_type : str
+            How the telemetry will be processed. e.g. "daily_means", "every_change"
+
+        Returns
+        -------
+        good_mnemonic_data : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing filtered data for the given mnemonic.
+            None if there are no data.
+        """
+        logging.info(f'Querying EDB for: {mnemonic["name"]} from {starting_time} to {ending_time}')
+
+        try:
+            # Use the results of an earlier query covering this time range, if present
+            mnemonic_data = self.get_query_result(mnemonic["name"], starting_time, ending_time)
+            if mnemonic_data is None:
+                mnemonic_data = ed.get_mnemonic(mnemonic["name"], starting_time, ending_time)
+
+            if len(mnemonic_data) == 0:
+                logging.info(f"No data returned from EDB for {mnemonic['name']} between {starting_time} and {ending_time}")
+                return None
+            else:
+                logging.info(f'Retrieved from EDB, {mnemonic["name"]} between {starting_time} and {ending_time} contains {len(mnemonic_data)} data points.')
+
+            # If the mnemonic has an alternative name (due to e.g. repeated calls for that mnemonic but with
+            # different averaging schemes), then update the mnemonic_identifier in the returned EdbMnemonic
+            # instance. This will allow different versions to be saved in the database. For example, monitoring
+            # a current value when a corresponding voltage value is low (i.e. turned off) and when it is high
+            # (turned on).
+            if "database_id" in mnemonic:
+                mnemonic_data.mnemonic_identifier = mnemonic["database_id"]
+            else:
+                mnemonic_data.mnemonic_identifier = mnemonic["name"]
+
+        except (urllib.error.HTTPError, HTTPError):
+            # Sanity check that the mnemonic is available in the EDB.
+            logging.info(f'{mnemonic["name"]} not accessible with current search.')
+            return None
+
+        # Filter the data to keep only those values/times where the dependency conditions are met.
+        if ((len(mnemonic["dependency"]) > 0) and (telemetry_type != "every_change")):
+            good_mnemonic_data = self.filter_telemetry(mnemonic["name"], mnemonic_data, mnemonic['dependency'])
+            if good_mnemonic_data is None:
+                logging.info(f'get_mnemonic_info returning data with zero length')
+                return None
+            logging.info(f'After filtering by dependencies, the number of data points is {len(good_mnemonic_data)}')
+        else:
+            # No dependencies. Keep all the data
+            good_mnemonic_data = mnemonic_data
+            good_mnemonic_data.blocks = [0]
+
+        return good_mnemonic_data
+
     def get_history(self, mnemonic, start_date, end_date, info={}, meta={}):
         """Retrieve data for a single mnemonic over the given time range from the JWQL
         database (not the EDB).
@@ -1054,33 +1234,30 @@ class EdbMnemonicMonitor():
         hist : jwql.edb.engineering_database.EdbMnemonic
             Retrieved data
         """
-        data = session.query(self.history_table) \
+        # Retrieve only the columns needed, with the rows in chronological order, so that
+        # the combined data are sorted by date
+        rows = session.query(self.history_table.times, self.history_table.data, self.history_table.median,
+                             self.history_table.max, self.history_table.min) \
             .filter(self.history_table.mnemonic == mnemonic,
                     self.history_table.latest_query > start_date,
-                    self.history_table.latest_query < end_date)
+                    self.history_table.latest_query < end_date) \
+            .order_by(self.history_table.latest_query).all()
 
-        all_dates = []
-        all_values = []
-        all_medians = []
-        all_means = []
-        all_maxs = []
-        all_mins = []
         # Each row contains a list of dates and data that could have elements
-        # outside of the plot range. Return only the points inside the desired
-        # plot range
-        for row in data:
-            good = np.where((np.array(row.times) > self._plot_start) & (np.array(row.times) < self._plot_end))[0]
-            times = list(np.array(row.times)[good])
-            data = list(np.array(row.data)[good])
-            medians = list(np.array(row.median)[good])
-            maxs = list(np.array(row.max)[good])
-            mins = list(np.array(row.min)[good])
-            all_dates.extend(times)
-            all_values.extend(data)
-            all_means.extend(data)
-            all_medians.extend(medians)
-            all_maxs.extend(maxs)
-            all_mins.extend(mins)
+        # outside of the plot range. Concatenate all rows and return only the
+        # points inside the desired plot range
+        if len(rows) > 0:
+            columns = [np.concatenate([np.asarray(row[i]) for row in rows]) for i in range(5)]
+            all_times, all_data, all_medians, all_maxs, all_mins = columns
+            good = (all_times > self._plot_start) & (all_times < self._plot_end)
+            all_dates = list(all_times[good])
+            all_values = list(all_data[good])
+            all_means = list(all_data[good])
+            all_medians = list(all_medians[good])
+            all_maxs = list(all_maxs[good])
+            all_mins = list(all_mins[good])
+        else:
+            all_dates, all_values, all_means, all_medians, all_maxs, all_mins = [], [], [], [], [], []
 
         tab = Table([all_dates, all_values], names=('dates', 'euvalues'))
         hist = ed.EdbMnemonic(mnemonic, start_date, end_date, tab, meta, info)
@@ -1152,6 +1329,35 @@ class EdbMnemonicMonitor():
 
         return hist
 
+    def get_mnemonic_cached(self, mnemonic_name, starttime, endtime):
+        """Return EDB data for the given mnemonic and time range. If the on-disk cache
+        already covers the time range, the data are read from there. Otherwise the EDB
+        is queried and the results are added to the cache.
+
+        Parameters
+        ----------
+        mnemonic_name : str
+            Name of the mnemonic to retrieve
+
+        starttime : datetime.datetime
+            Starting time for the query
+
+        endtime : datetime.datetime
+            Ending time for the query
+
+        Returns
+        -------
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the data
+        """
+        mnemonic = self.read_mnemonic_cache(mnemonic_name, starttime, endtime)
+        if mnemonic is None:
+            mnemonic = ed.get_mnemonic(mnemonic_name, starttime, endtime)
+            self.write_mnemonic_cache(mnemonic)
+        else:
+            logging.info(f'Retrieved {mnemonic_name} data from the cache in {self.cache_dir}')
+        return mnemonic
+
     def get_mnemonic_info(self, mnemonic, starting_time, ending_time, telemetry_type):
         """Wrapper around the code to query the EDB, filter the result, and calculate
         appropriate statistics for a single mnemonic
@@ -1177,40 +1383,16 @@ class EdbMnemonicMonitor():
         good_mnemonic_data : jwql.edb.engineering_database.EdbMnemonic
             EdbMnemonic instance containing filtered data for the given mnemonic
         """
-        logging.info(f'Querying EDB for: {mnemonic["name"]} from {starting_time} to {ending_time}')
-
-        try:
-            mnemonic_data = ed.get_mnemonic(mnemonic["name"], starting_time, ending_time)
-
-            if len(mnemonic_data) == 0:
-                logging.info(f"No data returned from EDB for {mnemonic['name']} between {starting_time} and {ending_time}")
+        # Use previously filtered data for this time range, if present in the on-disk cache
+        cache_file = self.conditioned_cache_file(mnemonic, starting_time, ending_time, telemetry_type)
+        good_mnemonic_data = self.read_conditioned_cache(cache_file, starting_time, ending_time)
+        if good_mnemonic_data is None:
+            good_mnemonic_data = self.get_filtered_data(mnemonic, starting_time, ending_time, telemetry_type)
+            if good_mnemonic_data is None:
                 return None
-            else:
-                logging.info(f'Retrieved from EDB, {mnemonic["name"]} between {starting_time} and {ending_time} contains {len(mnemonic_data)} data points.')
-
-            # If the mnemonic has an alternative name (due to e.g. repeated calls for that mnemonic but with
-            # different averaging schemes), then update the mnemonic_identifier in the returned EdbMnemonic
-            # instance. This will allow different versions to be saved in the database. For example, monitoring
-            # a current value when a corresponding voltage value is low (i.e. turned off) and when it is high
-            # (turned on).
-            if "database_id" in mnemonic:
-                mnemonic_data.mnemonic_identifier = mnemonic["database_id"]
-            else:
-                mnemonic_data.mnemonic_identifier = mnemonic["name"]
-
-        except (urllib.error.HTTPError, HTTPError):
-            # Sanity check that the mnemonic is available in the EDB.
-            logging.info(f'{mnemonic["name"]} not accessible with current search.')
-            return None
-
-        # Filter the data to keep only those values/times where the dependency conditions are met.
-        if ((len(mnemonic["dependency"]) > 0) and (telemetry_type != "every_change")):
-            good_mnemonic_data = self.filter_telemetry(mnemonic["name"], mnemonic_data, mnemonic['dependency'])
-            logging.info(f'After filtering by dependencies, the number of data points is {len(good_mnemonic_data)}')
+            self.write_conditioned_cache(cache_file, good_mnemonic_data)
         else:
-            # No dependencies. Keep all the data
-            good_mnemonic_data = mnemonic_data
-            good_mnemonic_data.blocks = [0]
+            logging.info(f'Retrieved filtered {mnemonic["name"]} data from {cache_file}')
 
         if telemetry_type == "every_change":
             # If this is "every_change" data (i.e. we want to find the mean value of the mnemonic corresponding to
@@ -1230,6 +1412,145 @@ class EdbMnemonicMonitor():
             logging.info(f'get_mnemonic_info returning data with zero length')
             return None
 
+    def get_query_result(self, mnemonic_name, starttime, endtime):
+        """Extract the data for the given time range from the results of a previous
+        EDB query saved in ``self.query_results``.
+
+        Parameters
+        ----------
+        mnemonic_name : str
+            Name of the mnemonic
+
+        starttime : datetime.datetime
+            Starting time of the data to extract
+
+        endtime : datetime.datetime
+            Ending time of the data to extract
+
+        Returns
+        -------
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the data between ``starttime`` and ``endtime``.
+            None if there are no saved results covering the entire time range.
+        """
+        if mnemonic_name not in self.query_results:
+            return None
+
+        saved = self.query_results[mnemonic_name]
+        if saved.requested_start_time > starttime or saved.requested_end_time < endtime:
+            return None
+
+        if saved.change_only:
+            # For change-only data, add points at the start and end times that carry the
+            # values in effect at those times, as is done when querying the EDB directly.
+            dates, values = ed.change_only_bounding_points(saved.dates, saved.values, starttime, endtime)
+        else:
+            first = np.searchsorted(saved.dates, starttime, side='left')
+            last = np.searchsorted(saved.dates, endtime, side='right')
+            dates = saved.dates[first:last]
+            values = saved.values[first:last]
+
+        data = Table({'dates': dates, 'euvalues': values})
+        mnemonic = ed.EdbMnemonic(saved.mnemonic_identifier, starttime, endtime, data,
+                                  deepcopy(saved.meta), deepcopy(saved.info))
+        mnemonic.change_only = saved.change_only
+        return mnemonic
+
+    def get_query_times(self, mnemonic, telem_type, plot_start, plot_end):
+        """Determine the time ranges over which the EDB must be queried for a mnemonic,
+        based on the most recent search recorded in the JWQL database.
+
+        Parameters
+        ----------
+        mnemonic : dict
+            Dictionary of information for a single mnemonic, from the json file describing
+            all mnemonics to be monitored
+
+        telem_type : str
+            Type of telemetry being retrieved (e.g. "daily_means", "every_change", "all")
+
+        plot_start : datetime.datetime
+            Starting time for the output plot
+
+        plot_end : datetime.datetime
+            Ending time for the output plot
+
+        Returns
+        -------
+        query_times : dict
+            Dictionary containing the product identifier, the starting time of the new data,
+            the lists of query starting and ending times, and whether a new entry should be
+            added to the JWQL database.
+        """
+        create_new_history_entry = True
+
+        # Only two types of plots are currently supported. Plotting the data in the EdbMnemonic
+        # directly, and plotting it as the product with a second EdbMnemonic
+        if '*' not in mnemonic["plot_data"] and 'nominal' not in mnemonic["plot_data"]:
+            raise NotImplementedError(('The plot_data entry in the mnemonic dictionary can currently only '
+                                       'be "nominal" or "*<MNEMONIC_NAME>", indicating that the current '
+                                       'mnemonic should be plotted as the product of the mnemonic*<MNEMONIC_NAME>. '
+                                       'e.g. for a mnemonic that reports current, plot the data as a power by '
+                                       'multiplying with a mnemonic that reports voltage. No other mnemonic '
+                                       'combination schemes have been implemented.'))
+
+        # A mnemonic that is being monitored in more than one way will have a secondary name to
+        # use for the database, stored in the "database_id" key.
+        self._usename = 'name'
+        if 'database_id' in mnemonic:
+            self._usename = 'database_id'
+
+        # Construct the mnemonic identifer to be used for database entries and plot titles
+        if '*' in mnemonic["plot_data"]:
+            # Define the mnemonic identifier to be <mnemonic_name_1>*<mnemonic_name_2>
+            term2 = mnemonic["plot_data"].split(',')[0]
+            product_identifier = f'{mnemonic[self._usename]}{term2}'
+        else:
+            product_identifier = mnemonic[self._usename]
+
+        if telem_type != 'all':
+            # Find the end time of the previous query from the database.
+            most_recent_search = self.most_recent_search(product_identifier)
+
+            # For daily_means mnemonics, we force the search to always start at noon, and
+            # have a 1 day cadence
+            if telem_type == 'daily_means':
+                most_recent_search = datetime.datetime.combine(most_recent_search.date(), datetime.time(hour=12))
+
+            logging.info(f'Most recent search is {most_recent_search}.')
+            logging.info(f'Query cadence is {self.query_cadence}')
+
+            if plot_end > (most_recent_search + self.query_cadence):
+                # Here we need to query the EDB to cover the entire plot range
+                logging.info("Plot range extends outside the time contained in the JWQLDB. Need to query the EDB.")
+                logging.info(f"Plot_end: {plot_end}")
+                logging.info(f"Most recent search: {most_recent_search}")
+                logging.info(f"Search end: {most_recent_search + self.query_cadence}")
+                starttime = most_recent_search + self.query_cadence
+                logging.info(f"New starttime: {starttime}")
+            else:
+                # Here the entire plot range is before the most recent search,
+                # so all we need to do is query the JWQL database for the data.
+                logging.info(f"Plot time span contained entirely in JWQLDB. No need to query EDB.")
+                create_new_history_entry = False
+                starttime = None
+
+        else:
+            # In the case where telemetry data have no averaging done, we do not store the data
+            # in the JWQL database, in order to save space. So in this case, we will retrieve
+            # all of the data from the EDB directly, from some default start time until the
+            # present day.
+            starttime = plot_start
+            create_new_history_entry = False
+
+        query_start_times, query_end_times = self.generate_query_start_times(starttime)
+        logging.info(f'Query start times: {query_start_times}')
+        logging.info(f'Query end times: {query_end_times}')
+
+        return {"product_identifier": product_identifier, "starttime": starttime,
+                "query_start_times": query_start_times, "query_end_times": query_end_times,
+                "create_new_history_entry": create_new_history_entry}
+
     def identify_tables(self, inst, tel_type):
         """Determine which database tables to use for a given type of telemetry.
 
@@ -1249,6 +1570,9 @@ class EdbMnemonicMonitor():
         self.history_table_name = f'{mixed_case_name}EDB{tel_type}Stats'
         self.history_table = getattr(database_interface, f'{mixed_case_name}EDB{tel_type}Stats')
 
+        # Most recent query times are looked up per table, so reset them
+        self._latest_queries = None
+
     def most_recent_search(self, telem_name):
         """Query the database and return the information
         on the most recent query, indicating the last time the
@@ -1264,14 +1588,19 @@ class EdbMnemonicMonitor():
         query_result : datetime.datetime
             Date of the ending range of the previous query
         """
-        query = session.query(self.history_table).filter(self.history_table.mnemonic == telem_name).order_by(self.history_table.latest_query).all()
-
-        if len(query) == 0:
+        # Retrieve the latest query time of all mnemonics in the table with a single
+        # query, the first time this is called for the table.
+        if self._latest_queries is None:
+            query = session.query(self.history_table.mnemonic,
+                                  func.max(self.history_table.latest_query)).group_by(self.history_table.mnemonic).all()
+            self._latest_queries = dict(query)
+
+        if telem_name not in self._latest_queries:
             base_time = '2022-11-15 00:00:0.0'
             query_result = datetime.datetime.strptime(base_time, '%Y-%m-%d %H:%M:%S.%f')
             logging.info(f'\tNo query history for {telem_name}. Returning default "previous query" date of {base_time}.')
         else:
-            query_result = query[-1].latest_query
+            query_result = self._latest_queries[telem_name]
             logging.info(f'For {telem_name}, the previous query time is {query_result}')
 
         return query_result
@@ -1328,8 +1657,19 @@ class EdbMnemonicMonitor():
             product_identifier = f'{mnemonic_dict[self._usename]}{second_part}'
             logging.info(f'In multiday, product_identifier is: {product_identifier}')
 
+        # If the query time ranges are contiguous, then retrieve the entire time range from the
+        # EDB with a single query, rather than once per day. The daily data are then extracted
+        # from these results locally. The same is done for the product mnemonic and for all
+        # dependencies, so that each mnemonic needed is queried only once.
+        if len(starting_time_list) > 1 and self.query_duration >= self.query_cadence:
+            for prefetch_name in related_mnemonics(mnemonic_dict):
+                self.prefetch_mnemonic(prefetch_name, starting_time_list[0], ending_time_list[-1])
+
         # Work one start time/end time pair at a time.
         for i, (starttime, endtime) in enumerate(zip(starting_time_list, ending_time_list)):
+            # Drop saved query results from earlier days, which are no longer needed
+            self.evict_query_results(starttime)
+
             # This function wraps around the EDB query and dependency filtering.
             mnemonic_info = self.get_mnemonic_info(mnemonic_dict, starttime, endtime, telemetry_type)
 
@@ -1402,22 +1742,24 @@ class EdbMnemonicMonitor():
 
                 # Combine information from multiple days here. If averaging is done, keep track of
                 # only the averaged data. If no averaging is done, keep all data.
+                # The daily results are collected in lists and concatenated once all days
+                # have been processed.
                 if telemetry_type != 'all':
-                    multiday_median_times.extend(mnemonic_info.median_times)
-                    multiday_mean_vals.extend(mnemonic_info.mean)
-                    multiday_median_vals.extend(mnemonic_info.median)
-                    multiday_max_vals.extend(mnemonic_info.max)
-                    multiday_min_vals.extend(mnemonic_info.min)
-                    multiday_stdev_vals.extend(mnemonic_info.stdev)
+                    multiday_median_times.append(mnemonic_info.median_times)
+                    multiday_mean_vals.append(mnemonic_info.mean)
+                    multiday_median_vals.append(mnemonic_info.median)
+                    multiday_max_vals.append(mnemonic_info.max)
+                    multiday_min_vals.append(mnemonic_info.min)
+                    multiday_stdev_vals.append(mnemonic_info.stdev)
                     if telemetry_type == 'every_change':
-                        multiday_every_change_data.extend(mnemonic_info.every_change_values)
+                        multiday_every_change_data.append(mnemonic_info.every_change_values)
                 else:
-                    multiday_median_times.extend(mnemonic_info.data["dates"].data)
-                    multiday_mean_vals.extend(mnemonic_info.data["euvalues"].data)
-                    multiday_stdev_vals.extend(mnemonic_info.stdev)
-                    multiday_median_vals.extend(mnemonic_info.median)
-                    multiday_max_vals.extend(mnemonic_info.max)
-                    multiday_min_vals.extend(mnemonic_info.min)
+                    multiday_median_times.append(mnemonic_info.dates)
+                    multiday_mean_vals.append(mnemonic_info.values)
+                    multiday_stdev_vals.append(mnemonic_info.stdev)
+                    multiday_median_vals.append(mnemonic_info.median)
+                    multiday_max_vals.append(mnemonic_info.max)
+                    multiday_min_vals.append(mnemonic_info.min)
 
             else:
                 logging.info(f'{mnemonic_dict["name"]} has no data between {starttime} and {endtime}.')
@@ -1430,6 +1772,12 @@ class EdbMnemonicMonitor():
 
         # Combine the mean values and median time data from multiple days into a single EdbMnemonic
         # instance.
+        multiday_median_times = concatenate_chunks(multiday_median_times)
+        multiday_mean_vals = concatenate_chunks(multiday_mean_vals)
+        multiday_median_vals = concatenate_chunks(multiday_median_vals)
+        multiday_max_vals = concatenate_chunks(multiday_max_vals)
+        multiday_min_vals = concatenate_chunks(multiday_min_vals)
+        multiday_stdev_vals = concatenate_chunks(multiday_stdev_vals)
         multiday_table["dates"] = multiday_median_times
         multiday_table["euvalues"] = multiday_median_vals
         all_data = ed.EdbMnemonic(identifier, starting_time_list[0], ending_time_list[-1],
@@ -1444,7 +1792,7 @@ class EdbMnemonicMonitor():
         # If it is an every_change mnemonic, then we need to also keep track of the dependency
         # values that correspond to the mean values.
         if telemetry_type == 'every_change':
-            all_data.every_change_values = multiday_every_change_data
+            all_data.every_change_values = concatenate_chunks(multiday_every_change_data)
 
         # Set the mnemonic identifier to be <mnemonic_name_1>*<mnemonic_name_2>
         # This will be used in the title of the plot later
@@ -1454,6 +1802,167 @@ class EdbMnemonicMonitor():
         logging.info(f'DONE retrieving/filtering/averaging data for {mnemonic_dict["name"]}')
         return all_data
 
+    def multiday_query_result(self, job, mnemonic_dict, starting_time_list, ending_time_list, telemetry_type):
+        """Return the results of ``multiday_mnemonic_query`` for a mnemonic. If the query
+        was submitted to a worker process, wait for and return its results. Otherwise,
+        run the query here.
+
+        Parameters
+        ----------
+        job : concurrent.futures.Future
+            Future returned by ``submit_multiday_query``. If None, the query is run
+            in the current process.
+
+        mnemonic_dict : dict
+            Dictionary of information for a single mnemonic
+
+        starting_time_list : list
+            List of datetime values indicating beginning query times
+
+        ending_time_list : list
+            List of datetime values indicating the end time of each query
+
+        telemetry_type : str
+            Type of telemetry being retrieved
+
+        Returns
+        -------
+        all_data : jwql.edb.engineering_database.EdbMnemonic
+            EDBMnemonic instance containing the mnemonic's filtered, averaged data
+        """
+        if job is not None:
+            return job.result()
+        return self.multiday_mnemonic_query(mnemonic_dict, starting_time_list, ending_time_list, telemetry_type)
+
+    def prefetch_mnemonic(self, mnemonic_name, starttime, endtime):
+        """Query the EDB for a mnemonic over the full time range, and save the results
+        in ``self.query_results``, so that subsequent requests for shorter time ranges
+        can be satisfied without additional queries.
+
+        Parameters
+        ----------
+        mnemonic_name : str
+            Name of the mnemonic to query
+
+        starttime : datetime.datetime
+            Starting time for the query
+
+        endtime : datetime.datetime
+            Ending time for the query
+        """
+        if mnemonic_name in self.query_results:
+            saved = self.query_results[mnemonic_name]
+            if saved.requested_start_time <= starttime and saved.requested_end_time >= endtime:
+                return
+
+        # Use the results of a query already started in the background, if it covers the time range
+        if mnemonic_name in self._pending_queries:
+            pending_start, pending_end, job = self._pending_queries.pop(mnemonic_name)
+            if pending_start <= starttime and pending_end >= endtime:
+                try:
+                    self.query_results[mnemonic_name] = job.result()
+                except (urllib.error.HTTPError, HTTPError):
+                    logging.info(f'{mnemonic_name} not accessible with current search.')
+                return
+
+        logging.info(f'Querying EDB for {mnemonic_name} from {starttime} to {endtime} in a single query.')
+        try:
+            self.query_results[mnemonic_name] = self.get_mnemonic_cached(mnemonic_name, starttime, endtime)
+        except (urllib.error.HTTPError, HTTPError):
+            # Fall back to querying one day at a time
+            logging.info(f'{mnemonic_name} not accessible with current search.')
+
+    def read_conditioned_cache(self, cache_file, starttime, endtime):
+        """Read filtered mnemonic data from the on-disk cache.
+
+        Parameters
+        ----------
+        cache_file : str
+            Name of the cache file, from ``conditioned_cache_file``
+
+        starttime : datetime.datetime
+            Beginning time of the data
+
+        endtime : datetime.datetime
+            Ending time of the data
+
+        Returns
+        -------
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the filtered data. None if the cache file
+            does not exist.
+        """
+        if cache_file is None or not os.path.isfile(cache_file):
+            return None
+
+        with np.load(cache_file, allow_pickle=False) as cache:
+            # Values stored in single precision are returned to double precision, so that
+            # downstream statistics are calculated as they are for freshly queried data
+            euvalues = cache["euvalues"]
+            if euvalues.dtype == np.float32:
+                euvalues = euvalues.astype(np.float64)
+            data = Table({'dates': cache["dates"].astype(object), 'euvalues': euvalues})
+            meta = json.loads(str(cache["meta"]))
+            info = json.loads(str(cache["info"]))
+            mnemonic = ed.EdbMnemonic(str(cache["name"]), starttime, endtime, data, meta, info,
+                                      blocks=cache["blocks"])
+            mnemonic.change_only = bool(cache["change_only"])
+        return mnemonic
+
+    def read_mnemonic_cache(self, mnemonic_name, starttime, endtime):
+        """Read cached EDB query results for the given mnemonic, if the cache
+        covers the entire requested time range.
+
+        Parameters
+        ----------
+        mnemonic_name : str
+            Name of the mnemonic to retrieve
+
+        starttime : datetime.datetime
+            Starting time for the data
+
+        endtime : datetime.datetime
+            Ending time for the data
+
+        Returns
+        -------
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the cached data within the requested time
+            range. None if there is no cache, or if it does not cover the time range.
+        """
+        if self.cache_dir is None:
+            return None
+
+        cache_file = os.path.join(self.cache_dir, f'{mnemonic_name}.npz')
+        if not os.path.isfile(cache_file):
+            return None
+
+        with np.load(cache_file, allow_pickle=False) as cache:
+            start = datetime64_from_time(starttime)
+            end = datetime64_from_time(endtime)
+            if cache["coverage"][0] > start or cache["coverage"][1] < end:
+                return None
+
+            change_only = bool(cache["change_only"]) if "change_only" in cache.files else False
+            if change_only:
+                # For change-only data, add points at the start and end times that carry the
+                # values in effect at those times, as is done when querying the EDB directly.
+                dates, values = ed.change_only_bounding_points(cache["dates"].astype(object), cache["euvalues"],
+                                                               starttime, endtime)
+            else:
+                # Dates in the cache file are sorted, so we can slice rather than search
+                first = np.searchsorted(cache["dates"], start, side='left')
+                last = np.searchsorted(cache["dates"], end, side='right')
+                dates = cache["dates"][first:last].astype(object)
+                values = cache["euvalues"][first:last]
+            data = Table({'dates': dates, 'euvalues': values})
+            meta = json.loads(str(cache["meta"]))
+            info = json.loads(str(cache["info"]))
+
+        mnemonic = ed.EdbMnemonic(mnemonic_name, starttime, endtime, data, meta, info)
+        mnemonic.change_only = change_only
+        return mnemonic
+
     def run(self, instrument, mnemonic_dict, plot_start=None, plot_end=None):
         """Run the monitor on a single mnemonic.
 
@@ -1489,263 +1998,335 @@ class EdbMnemonicMonitor():
         self._plot_start = plot_start
         self._plot_end = plot_end
 
-        # At the top level, we loop over the different types of telemetry. These types
-        # largely control if/how the data will be averaged.
-        for telemetry_kind in mnemonic_dict:
-            telem_type = telemetry_kind
-            logging.info(f'Working on telemetry_type: {telem_type}')
-
-            # For the combined telemetry types (e.g. "all+daily_mean") break up
-            # into its component parts. Work on the second part (e.g. "daily_mean")
-            # first, and then the "all" part afterwards
-            if telemetry_kind in ALLOWED_COMBINATION_TYPES:
-                telem_type = telemetry_kind.split('+')[1]
-                logging.info(f'Working first on {telem_type}')
-
-            # Figure out the time duration over which the mnemonic should be queried. In
-            # most cases this is just a full day. In some cases ("daily_average" telem_type)
-            # the query will span a shorter time since the mnemonic won't change much over
-            # a full day.
-            self.query_duration = utils.get_query_duration(telem_type)
-
-            # Determine which database tables are needed based on instrument. A telemetry
-            # type of "all" indicates that no time-averaging is done, and therefore the
-            # data are not stored in the JWQL database (for database table size reasons).
-            if telem_type != 'all':
-                self.identify_tables(instrument, telem_type)
-
-            # Work on one mnemonic at a time
-            for mnemonic in mnemonic_dict[telemetry_kind]:
-                logging.info(f'Working on {mnemonic["name"]}')
-                create_new_history_entry = True
-
-                # Only two types of plots are currently supported. Plotting the data in the EdbMnemonic
-                # directly, and plotting it as the product with a second EdbMnemonic
-                if '*' not in mnemonic["plot_data"] and 'nominal' not in mnemonic["plot_data"]:
-                    raise NotImplementedError(('The plot_data entry in the mnemonic dictionary can currently only '
-                                               'be "nominal" or "*<MNEMONIC_NAME>", indicating that the current '
-                                               'mnemonic should be plotted as the product of the mnemonic*<MNEMONIC_NAME>. '
-                                               'e.g. for a mnemonic that reports current, plot the data as a power by '
-                                               'multiplying with a mnemonic that reports voltage. No other mnemonic '
-                                               'combination schemes have been implemented.'))
-
-                # A mnemonic that is being monitored in more than one way will have a secondary name to
-                # use for the database, stored in the "database_id" key.
-                self._usename = 'name'
-                if 'database_id' in mnemonic:
-                    self._usename = 'database_id'
-
-                # Construct the mnemonic identifer to be used for database entries and plot titles
-                if '*' in mnemonic["plot_data"]:
-                    # Define the mnemonic identifier to be <mnemonic_name_1>*<mnemonic_name_2>
-                    term2 = mnemonic["plot_data"].split(',')[0]
-                    product_identifier = f'{mnemonic[self._usename]}{term2}'
-                else:
-                    product_identifier = mnemonic[self._usename]
-
+        # Pool of worker processes used to query, filter, and average the data for
+        # multiple mnemonics simultaneously
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            # When working serially, retrieve the EDB data for the next mnemonic in background
+            # threads while the current mnemonic is being filtered, averaged, and plotted.
+            # Each thread queries the EDB through its own service instance, since those
+            # are not thread-safe (see ed.get_engdb_service).
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=4)
+
+        # Shut down the pools even if processing fails, so that queries that have not
+        # started yet are cancelled rather than keeping the process alive until they finish
+        try:
+            # At the top level, we loop over the different types of telemetry. These types
+            # largely control if/how the data will be averaged.
+            for telemetry_kind in mnemonic_dict:
+                telem_type = telemetry_kind
+                logging.info(f'Working on telemetry_type: {telem_type}')
+
+                # For the combined telemetry types (e.g. "all+daily_mean") break up
+                # into its component parts. Work on the second part (e.g. "daily_mean")
+                # first, and then the "all" part afterwards
+                if telemetry_kind in ALLOWED_COMBINATION_TYPES:
+                    telem_type = telemetry_kind.split('+')[1]
+                    logging.info(f'Working first on {telem_type}')
+
+                # Figure out the time duration over which the mnemonic should be queried. In
+                # most cases this is just a full day. In some cases ("daily_average" telem_type)
+                # the query will span a shorter time since the mnemonic won't change much over
+                # a full day.
+                self.query_duration = utils.get_query_duration(telem_type)
+
+                # Determine which database tables are needed based on instrument. A telemetry
+                # type of "all" indicates that no time-averaging is done, and therefore the
+                # data are not stored in the JWQL database (for database table size reasons).
                 if telem_type != 'all':
-                    # Find the end time of the previous query from the database.
-                    most_recent_search = self.most_recent_search(product_identifier)
-
-                    # For daily_means mnemonics, we force the search to always start at noon, and
-                    # have a 1 day cadence
-                    if telem_type == 'daily_means':
-                        most_recent_search = datetime.datetime.combine(most_recent_search.date(), datetime.time(hour=12))
-
-                    logging.info(f'Most recent search is {most_recent_search}.')
-                    logging.info(f'Query cadence is {self.query_cadence}')
-
-                    if plot_end > (most_recent_search + self.query_cadence):
-                        # Here we need to query the EDB to cover the entire plot range
-                        logging.info("Plot range extends outside the time contained in the JWQLDB. Need to query the EDB.")
-                        logging.info(f"Plot_end: {plot_end}")
-                        logging.info(f"Most recent search: {most_recent_search}")
-                        logging.info(f"Search end: {most_recent_search + self.query_cadence}")
-                        starttime = most_recent_search + self.query_cadence
-                        logging.info(f"New starttime: {starttime}")
-                    else:
-                        # Here the entire plot range is before the most recent search,
-                        # so all we need to do is query the JWQL database for the data.
-                        logging.info(f"Plot time span contained entirely in JWQLDB. No need to query EDB.")
-                        create_new_history_entry = False
-                        starttime = None
+                    self.identify_tables(instrument, telem_type)
+
+                # Determine the query times for all mnemonics. When using multiple worker processes,
+                # start the EDB queries, filtering, and averaging for all mnemonics right away, since
+                # these are independent of one another. The results are collected in order below.
+                all_query_times = []
+                for mnemonic in mnemonic_dict[telemetry_kind]:
+                    query_times = self.get_query_times(mnemonic, telem_type, plot_start, plot_end)
+                    query_times["usename"] = self._usename
+                    query_times["new_data"] = None
+                    query_times["additional_data"] = None
+                    if telem_type == 'all' or query_times["query_start_times"] is not None:
+                        query_times["new_data"] = self.submit_multiday_query(executor, mnemonic, query_times["query_start_times"],
+                                                                             query_times["query_end_times"], telem_type)
+                    if telemetry_kind in ALLOWED_COMBINATION_TYPES:
+                        full_query_start_times, full_query_end_times = self.generate_query_start_times(self._plot_start)
+                        query_times["additional_data"] = self.submit_multiday_query(executor, mnemonic, full_query_start_times,
+                                                                                    full_query_end_times, "all")
+                    all_query_times.append(query_times)
+
+                # Work on one mnemonic at a time
+                for i, (mnemonic, query_times) in enumerate(zip(mnemonic_dict[telemetry_kind], all_query_times)):
+                    logging.info(f'Working on {mnemonic["name"]}')
+
+                    # Start retrieving the data for the next mnemonic while working on this one
+                    if i + 1 < len(all_query_times):
+                        self.submit_prefetch(mnemonic_dict[telemetry_kind][i + 1], all_query_times[i + 1]["query_start_times"],
+                                             all_query_times[i + 1]["query_end_times"])
+
+                    self._usename = query_times["usename"]
+                    product_identifier = query_times["product_identifier"]
+                    starttime = query_times["starttime"]
+                    query_start_times = query_times["query_start_times"]
+                    query_end_times = query_times["query_end_times"]
+                    create_new_history_entry = query_times["create_new_history_entry"]
+
+                    if telem_type != 'all':
+                        if query_start_times is not None:
+
+                            # Query the EDB/JWQLDB, filter by dependencies, and perform averaging
+                            new_data = self.multiday_query_result(query_times["new_data"], mnemonic, query_start_times,
+                                                                  query_end_times, telem_type)
 
-                else:
-                    # In the case where telemetry data have no averaging done, we do not store the data
-                    # in the JWQL database, in order to save space. So in this case, we will retrieve
-                    # all of the data from the EDB directly, from some default start time until the
-                    # present day.
-                    starttime = plot_start
-                    create_new_history_entry = False
+                        else:
+                            # In this case, all the data needed are already in the JWQLDB, so return an empty
+                            # EDBMnemonic instance. This will be combined with the data from the JWQLDB later.
+                            info = ed.get_mnemonic_info(mnemonic["name"])
+                            new_data = empty_edb_instance(mnemonic[self._usename], plot_start, plot_end, info=info)
+                            new_data.mnemonic_identifier = product_identifier
+                            logging.info(f'All data needed are already in JWQLDB.')
+                            create_new_history_entry = False
+                    else:
+                        # For data where no averaging is done, all data must be retrieved from EDB. They are not
+                        # stored in the JWQLDB
+                        new_data = self.multiday_query_result(query_times["new_data"], mnemonic, query_start_times,
+                                                              query_end_times, telem_type)
+
+                    # Save the averaged/smoothed data and dates/times to the database, but only for cases where we
+                    # are averaging. For cases with no averaging the database would get too large too quickly. In
+                    # that case the monitor will re-query the EDB for the entire history each time.
+                    if telem_type != "all":
+
+                        # "every_change" data must be treated differently from other types of averaging, since
+                        # those mnemonics have their data separated into collections based on the value of a
+                        # dependency.
+                        if telem_type != 'every_change':
+
+                            # Retrieve the historical data from the database, so that we can add the new data
+                            # to it
+                            historical_data = self.get_history(new_data.mnemonic_identifier, plot_start, plot_end, info=new_data.info,
+                                                               meta=new_data.meta)
+                            ending = starttime
+                            if ending is None:
+                                ending = plot_end
+                            historical_data.requested_end_time = ending
+
+                            logging.info(f'Retrieved data from JWQLDB. Number of data points: {len(historical_data)}')
+
+                            # Add the data newly filtered and averaged data retrieved from the EDB to the JWQLDB
+                            # If no new data were retrieved from the EDB, then there is no need to add an entry to the JWQLDB
+                            if create_new_history_entry:
+                                self.add_new_block_db_entry(new_data, query_start_times[-1])
+                                logging.info('New data added to the JWQLDB.')
+                            else:
+                                logging.info("No new data retrieved from EDB, so no new entry added to JWQLDB")
+
+                            # Now add the new data to the historical data
+                            mnemonic_info = new_data + historical_data
+                            logging.info(f'Combined new data plus historical data contains {len(mnemonic_info)} data points.')
+                        else:
+                            # "every_change" data is more complex, and requires custom functions
+                            # Retrieve the historical data from the database, so that we can add the new data
+                            # to it
+                            historical_data = self.get_history_every_change(new_data.mnemonic_identifier, plot_start, plot_end)
+                            logging.info(f'Retrieved data from JWQLDB. Number of data points per key:')
+                            for key in historical_data:
+                                logging.info(f'Key: {key}, Num of Points: {len(historical_data[key][0])}')
+                            if historical_data == {}:
+                                logging.info('No historical data')
+
+                            # Before we can add the every-change data to the database, organize it to make it
+                            # easier to access. Note that every_change_data is now a dict rather than an EDBMnemonic instance
+                            every_change_data = organize_every_change(new_data)
+
+                            # Add new data to JWQLDB.
+                            # If no new data were retrieved from the EDB, then there is no need to add an entry to the JWQLDB
+                            if create_new_history_entry:
+                                self.add_new_every_change_db_entry(new_data.mnemonic_identifier, every_change_data, mnemonic['dependency'][0]["name"],
+                                                                   query_start_times[-1])
+                            else:
+                                logging.info("No new data retrieved from EDB, so no new entry added to JWQLDB")
+
+                            # Combine the historical data with the new data from the EDB
+                            for key in every_change_data:
+                                logging.info(f'Key: {key}, Num of Points: {len(every_change_data[key][0])}')
+                            logging.info(f'Total number of points in new_data from the EDB: {len(new_data)}')
+
+                            # Note that the line below will change mnemonic_info into a dictionary
+                            mnemonic_info = add_every_change_history(historical_data, every_change_data)
+
+                            logging.info(f'Combined new data plus historical data. Number of data points per key:')
+                            for key in mnemonic_info:
+                                logging.info(f'Key: {key}, Num of Points: {len(mnemonic_info[key][0])}')
 
-                query_start_times, query_end_times = self.generate_query_start_times(starttime)
-                logging.info(f'Query start times: {query_start_times}')
-                logging.info(f'Query end times: {query_end_times}')
+                    else:
+                        mnemonic_info = new_data
 
-                if telem_type != 'all':
-                    if query_start_times is not None:
+                    # For a telemetry_kind that is a combination of all+something, here we work on the "all" part.
+                    if telemetry_kind in ALLOWED_COMBINATION_TYPES:
+                        temp_telem_type = "all"
 
                         # Query the EDB/JWQLDB, filter by dependencies, and perform averaging
-                        new_data = self.multiday_mnemonic_query(mnemonic, query_start_times, query_end_times, telem_type)
+                        full_query_start_times, full_query_end_times = self.generate_query_start_times(self._plot_start)
+                        additional_data = self.multiday_query_result(query_times["additional_data"], mnemonic, full_query_start_times,
+                                                                     full_query_end_times, temp_telem_type)
+
+                        # Now arrange the data in a way that makes sense. Place the non-averaged data collected above
+                        # into self.data, and the averaged data into the self.mean and self.median_times attributes
+                        mnemonic_info.mean = mnemonic_info.data["euvalues"].value
+                        mnemonic_info.median_times = mnemonic_info.data["dates"].value
+                        tmp_table = Table()
+                        tmp_table["dates"] = additional_data.data["dates"]
+                        tmp_table["euvalues"] = additional_data.data["euvalues"]
+                        mnemonic_info.data = tmp_table
+
+                    # If there are no data for this mnemonic in the plot range, either from the EDB or from
+                    # the JWQLDB, then there is nothing to plot. The JWQLDB entries above are still added, so
+                    # that the next run of the monitor does not search this time range again.
+                    if len(mnemonic_info) == 0:
+                        logging.info(f'No data for {mnemonic["name"]} between {plot_start} and {plot_end}. Skipping plot.')
+                        continue
 
+                    # Create plot
+                    # If there is a nominal value, or yellow/red limits to be included in the plot, get those here
+                    nominal = utils.check_key(mnemonic, "nominal_value")
+                    yellow = utils.check_key(mnemonic, "yellow_limits")
+                    red = utils.check_key(mnemonic, "red_limits")
+
+                    # Make the plot title as useful as possible. Include the description from the input json
+                    # file. If there is none, fall back to the description from MAST. If that is also not
+                    # present, then the title will be only the mnemonic name.
+                    if 'description' in mnemonic:
+                        plot_title = f'{new_data.mnemonic_identifier}: {mnemonic["description"]}'
+                    elif 'description' in new_data.info:
+                        plot_title = f'{new_data.mnemonic_identifier}: {new_data.info["description"]}'
                     else:
-                        # In this case, all the data needed are already in the JWQLDB, so return an empty
-                        # EDBMnemonic instance. This will be combined with the data from the JWQLDB later.
-                        info = ed.get_mnemonic_info(mnemonic["name"])
-                        new_data = empty_edb_instance(mnemonic[self._usename], plot_start, plot_end, info=info)
-                        new_data.mnemonic_identifier = product_identifier
-                        logging.info(f'All data needed are already in JWQLDB.')
-                        create_new_history_entry = False
-                else:
-                    # For data where no averaging is done, all data must be retrieved from EDB. They are not
-                    # stored in the JWQLDB
-                    new_data = self.multiday_mnemonic_query(mnemonic, query_start_times, query_end_times, telem_type)
-
-                # Save the averaged/smoothed data and dates/times to the database, but only for cases where we
-                # are averaging. For cases with no averaging the database would get too large too quickly. In
-                # that case the monitor will re-query the EDB for the entire history each time.
-                if telem_type != "all":
-
-                    # "every_change" data must be treated differently from other types of averaging, since
-                    # those mnemonics have their data separated into collections based on the value of a
-                    # dependency.
-                    if telem_type != 'every_change':
-
-                        # Retrieve the historical data from the database, so that we can add the new data
-                        # to it
-                        historical_data = self.get_history(new_data.mnemonic_identifier, plot_start, plot_end, info=new_data.info,
-                                                           meta=new_data.meta)
-                        ending = starttime
-                        if ending is None:
-                            ending = plot_end
-                        historical_data.requested_end_time = ending
-
-                        logging.info(f'Retrieved data from JWQLDB. Number of data points: {len(historical_data)}')
-
-                        # Add the data newly filtered and averaged data retrieved from the EDB to the JWQLDB
-                        # If no new data were retrieved from the EDB, then there is no need to add an entry to the JWQLDB
-                        if create_new_history_entry:
-                            self.add_new_block_db_entry(new_data, query_start_times[-1])
-                            logging.info('New data added to the JWQLDB.')
-                        else:
-                            logging.info("No new data retrieved from EDB, so no new entry added to JWQLDB")
-
-                        # Now add the new data to the historical data
-                        mnemonic_info = new_data + historical_data
-                        logging.info(f'Combined new data plus historical data contains {len(mnemonic_info)} data points.')
+                        plot_title = new_data.mnemonic_identifier
+
+                    if telemetry_kind == 'every_change':
+                        # For every_change data, the plot is more complex, and we must use the custom
+                        # plot_every_change_data() method. Again, return the figure object without saving it.
+                        figure = plot_every_change_data(mnemonic_info, new_data.mnemonic_identifier, new_data.info["unit"],
+                                                        savefig=False, out_dir=self.plot_output_dir, show_plot=False, return_components=False,
+                                                        return_fig=True, title=plot_title, minimal_start=self._plot_start,
+                                                        minimal_end=self._plot_end)
+
+                    elif telemetry_kind in ALLOWED_COMBINATION_TYPES:
+                        figure = mnemonic_info.plot_data_plus_devs(savefig=False, out_dir=self.plot_output_dir, nominal_value=nominal,
+                                                                   yellow_limits=yellow, red_limits=red, return_components=False,
+                                                                   return_fig=True, show_plot=False, title=plot_title,
+                                                                   max_points=EDB_MAX_PLOT_POINTS)
                     else:
-                        # "every_change" data is more complex, and requires custom functions
-                        # Retrieve the historical data from the database, so that we can add the new data
-                        # to it
-                        historical_data = self.get_history_every_change(new_data.mnemonic_identifier, plot_start, plot_end)
-                        logging.info(f'Retrieved data from JWQLDB. Number of data points per key:')
-                        for key in historical_data:
-                            logging.info(f'Key: {key}, Num of Points: {len(historical_data[key][0])}')
-                        if historical_data == {}:
-                            logging.info('No historical data')
-
-                        # Before we can add the every-change data to the database, organize it to make it
-                        # easier to access. Note that every_change_data is now a dict rather than an EDBMnemonic instance
-                        every_change_data = organize_every_change(new_data)
-
-                        # Add new data to JWQLDB.
-                        # If no new data were retrieved from the EDB, then there is no need to add an entry to the JWQLDB
-                        if create_new_history_entry:
-                            self.add_new_every_change_db_entry(new_data.mnemonic_identifier, every_change_data, mnemonic['dependency'][0]["name"],
-                                                               query_start_times[-1])
-                        else:
-                            logging.info("No new data retrieved from EDB, so no new entry added to JWQLDB")
+                        # For telemetry types other than every_change, the data will be contained in an instance of
+                        # and EDBMnemonic. In this case, we can create the plot using the bokeh_plot method. The default
+                        # behavior is to return the Bokeh figure itself, rather than the script and div. Also, do not
+                        # save the figure and return the figure, or else Bokeh will later fail with an error that figure
+                        # elements are shared between documents.
+                        plot_mean = False
+                        plot_median = False
+                        plot_max = False
+                        plot_min = False
+                        plot_parts = mnemonic["plot_data"].split(',')
+                        if 'median' in plot_parts:
+                            # Assume that we want to plot only one of the mean and median
+                            plot_median = True
+                            plot_mean = False
+                        if 'max' in plot_parts:
+                            plot_max = True
+                        if 'min' in plot_parts:
+                            plot_min = True
+
+                        figure = mnemonic_info.bokeh_plot(savefig=False, out_dir=self.plot_output_dir, nominal_value=nominal,
+                                                          yellow_limits=yellow, red_limits=red, return_components=False,
+                                                          return_fig=True, show_plot=False, title=plot_title, plot_mean=plot_mean,
+                                                          plot_median=plot_median, plot_max=plot_max, plot_min=plot_min,
+                                                          max_points=EDB_MAX_PLOT_POINTS)
+
+                    # Add the figure to a dictionary that organizes the plots by plot_category
+                    self.add_figure(figure, mnemonic["plot_category"])
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if self._prefetch_executor is not None:
+                self._prefetch_executor.shutdown(cancel_futures=True)
+                self._prefetch_executor = None
+                self._pending_queries = {}
 
-                        # Combine the historical data with the new data from the EDB
-                        for key in every_change_data:
-                            logging.info(f'Key: {key}, Num of Points: {len(every_change_data[key][0])}')
-                        logging.info(f'Total number of points in new_data from the EDB: {len(new_data)}')
+        # Create a tabbed, gridded set of plots for each category of plot, and save as a json file.
+        self.tabbed_figure()
 
-                        # Note that the line below will change mnemonic_info into a dictionary
-                        mnemonic_info = add_every_change_history(historical_data, every_change_data)
+    def submit_multiday_query(self, executor, mnemonic_dict, starting_time_list, ending_time_list, telemetry_type):
+        """Submit ``multiday_mnemonic_query`` for a mnemonic to a pool of worker processes.
 
-                        logging.info(f'Combined new data plus historical data. Number of data points per key:')
-                        for key in mnemonic_info:
-                            logging.info(f'Key: {key}, Num of Points: {len(mnemonic_info[key][0])}')
+        Parameters
+        ----------
+        executor : concurrent.futures.ProcessPoolExecutor
+            Pool of worker processes. If None, nothing is submitted.
 
-                else:
-                    mnemonic_info = new_data
+        mnemonic_dict : dict
+            Dictionary of information for a single mnemonic
 
-                # For a telemetry_kind that is a combination of all+something, here we work on the "all" part.
-                if telemetry_kind in ALLOWED_COMBINATION_TYPES:
-                    temp_telem_type = "all"
-
-                    # Query the EDB/JWQLDB, filter by dependencies, and perform averaging
-                    full_query_start_times, full_query_end_times = self.generate_query_start_times(self._plot_start)
-                    additional_data = self.multiday_mnemonic_query(mnemonic, full_query_start_times, full_query_end_times, temp_telem_type)
-
-                    # Now arrange the data in a way that makes sense. Place the non-averaged data collected above
-                    # into self.data, and the averaged data into the self.mean and self.median_times attributes
-                    mnemonic_info.mean = mnemonic_info.data["euvalues"].value
-                    mnemonic_info.median_times = mnemonic_info.data["dates"].value
-                    tmp_table = Table()
-                    tmp_table["dates"] = additional_data.data["dates"]
-                    tmp_table["euvalues"] = additional_data.data["euvalues"]
-                    mnemonic_info.data = tmp_table
-
-                # Create plot
-                # If there is a nominal value, or yellow/red limits to be included in the plot, get those here
-                nominal = utils.check_key(mnemonic, "nominal_value")
-                yellow = utils.check_key(mnemonic, "yellow_limits")
-                red = utils.check_key(mnemonic, "red_limits")
-
-                # Make the plot title as useful as possible. Include the description from the input json
-                # file. If there is none, fall back to the description from MAST. If that is also not
-                # present, then the title will be only the mnemonic name.
-                if 'description' in mnemonic:
-                    plot_title = f'{new_data.mnemonic_identifier}: {mnemonic["description"]}'
-                elif 'description' in new_data.info:
-                    plot_title = f'{new_data.mnemonic_identifier}: {new_data.info["description"]}'
-                else:
-                    plot_title = new_data.mnemonic_identifier
-
-                if telemetry_kind == 'every_change':
-                    # For every_change data, the plot is more complex, and we must use the custom
-                    # plot_every_change_data() method. Again, return the figure object without saving it.
-                    figure = plot_every_change_data(mnemonic_info, new_data.mnemonic_identifier, new_data.info["unit"],
-                                                    savefig=False, out_dir=self.plot_output_dir, show_plot=False, return_components=False,
-                                                    return_fig=True, title=plot_title, minimal_start=self._plot_start,
-                                                    minimal_end=self._plot_end)
-
-                elif telemetry_kind in ALLOWED_COMBINATION_TYPES:
-                    figure = mnemonic_info.plot_data_plus_devs(savefig=False, out_dir=self.plot_output_dir, nominal_value=nominal,
-                                                               yellow_limits=yellow, red_limits=red, return_components=False,
-                                                               return_fig=True, show_plot=False, title=plot_title)
-                else:
-                    # For telemetry types other than every_change, the data will be contained in an instance of
-                    # and EDBMnemonic. In this case, we can create the plot using the bokeh_plot method. The default
-                    # behavior is to return the Bokeh figure itself, rather than the script and div. Also, do not
-                    # save the figure and return the figure, or else Bokeh will later fail with an error that figure
-                    # elements are shared between documents.
-                    plot_mean = False
-                    plot_median = False
-                    plot_max = False
-                    plot_min = False
-                    plot_parts = mnemonic["plot_data"].split(',')
-                    if 'median' in plot_parts:
-                        # Assume that we want to plot only one of the mean and median
-                        plot_median = True
-                        plot_mean = False
-                    if 'max' in plot_parts:
-                        plot_max = True
-                    if 'min' in plot_parts:
-                        plot_min = True
+        starting_time_list : list
+            List of datetime values indicating beginning query times
 
-                    figure = mnemonic_info.bokeh_plot(savefig=False, out_dir=self.plot_output_dir, nominal_value=nominal,
-                                                      yellow_limits=yellow, red_limits=red, return_components=False,
-                                                      return_fig=True, show_plot=False, title=plot_title, plot_mean=plot_mean,
-                                                      plot_median=plot_median, plot_max=plot_max, plot_min=plot_min)
+        ending_time_list : list
+            List of datetime values indicating the end time of each query
 
-                # Add the figure to a dictionary that organizes the plots by plot_category
-                self.add_figure(figure, mnemonic["plot_category"])
+        telemetry_type : str
+            Type of telemetry being retrieved
 
-        # Create a tabbed, gridded set of plots for each category of plot, and save as a json file.
-        self.tabbed_figure()
+        Returns
+        -------
+        job : concurrent.futures.Future
+            Future that will hold the ``EdbMnemonic`` returned by ``multiday_mnemonic_query``.
+            None if ``executor`` is None.
+        """
+        if executor is None:
+            return None
+
+        # Only the attributes needed by multiday_mnemonic_query are sent to the worker
+        state = {"_usename": self._usename, "query_duration": self.query_duration, "query_cadence": self.query_cadence,
+                 "cache_dir": self.cache_dir, "_today": self._today, "_plot_start": self._plot_start,
+                 "_plot_end": self._plot_end}
+        return executor.submit(multiday_query_worker, state, mnemonic_dict, starting_time_list, ending_time_list,
+                               telemetry_type)
+
+    def submit_prefetch(self, mnemonic_dict, starting_time_list, ending_time_list):
+        """Start retrieving the EDB data for a mnemonic, its product mnemonic, and its
+        dependencies in background threads. The results are picked up by ``prefetch_mnemonic``
+        when the mnemonic is processed.
+
+        Parameters
+        ----------
+        mnemonic_dict : dict
+            Dictionary of information for a single mnemonic
+
+        starting_time_list : list
+            List of datetime values indicating beginning query times
+
+        ending_time_list : list
+            List of datetime values indicating the end time of each query
+        """
+        if self._prefetch_executor is None or starting_time_list is None:
+            return
+
+        # Only contiguous time ranges are retrieved with a single query in multiday_mnemonic_query
+        if len(starting_time_list) < 2 or self.query_duration < self.query_cadence:
+            return
+
+        starttime = starting_time_list[0]
+        endtime = ending_time_list[-1]
+        for name in related_mnemonics(mnemonic_dict):
+            if name in self._pending_queries:
+                continue
+            if name in self.query_results:
+                saved = self.query_results[name]
+                if saved.requested_start_time <= starttime and saved.requested_end_time >= endtime:
+                    continue
+            logging.info(f'Starting background query of EDB for {name} from {starttime} to {endtime}.')
+            job = self._prefetch_executor.submit(self.get_mnemonic_cached, name, starttime, endtime)
+            self._pending_queries[name] = (starttime, endtime, job)
 
     def tabbed_figure(self, ncols=2):
         """Create a tabbed object containing a panel of gridded plots in each tab.
@@ -1773,6 +2354,85 @@ class EdbMnemonicMonitor():
             outfile.write(item_text)
         logging.info(f'JSON file with tabbed plots saved to {output_file}')
 
+    def write_conditioned_cache(self, cache_file, mnemonic):
+        """Save filtered mnemonic data to the on-disk cache.
+
+        Parameters
+        ----------
+        cache_file : str
+            Name of the cache file, from ``conditioned_cache_file``. If None, nothing
+            is saved.
+
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the filtered data
+        """
+        if cache_file is None:
+            return
+
+        values = np.asarray(mnemonic.values)
+        if values.dtype == object:
+            # Only arrays that can be saved without pickling are cached
+            return
+
+        # Many telemetry values originate as single precision. When that is the case,
+        # store them as float32, which halves the size of the cache file without
+        # losing any information.
+        if values.dtype == np.float64:
+            single = values.astype(np.float32)
+            if np.array_equal(single, values, equal_nan=True):
+                values = single
+
+        ensure_dir_exists(os.path.dirname(cache_file))
+        temp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_file, 'wb') as fobj:
+            np.savez(fobj, dates=np.array(mnemonic.dates, dtype='datetime64[us]'), euvalues=values,
+                     blocks=np.array(mnemonic.blocks, dtype=int), name=mnemonic.mnemonic_identifier,
+                     change_only=mnemonic.change_only, meta=json.dumps(mnemonic.meta, default=str),
+                     info=json.dumps(mnemonic.info, default=str))
+        os.replace(temp_file, cache_file)
+
+    def write_mnemonic_cache(self, mnemonic):
+        """Add EDB query results to the on-disk cache for the mnemonic. The cached
+        data are kept sorted by date, with duplicate dates removed. If the new data
+        do not overlap the time range already in the cache, the cache is replaced.
+
+        Parameters
+        ----------
+        mnemonic : jwql.edb.engineering_database.EdbMnemonic
+            EdbMnemonic instance containing the data to be cached
+        """
+        if self.cache_dir is None or len(mnemonic) == 0:
+            return
+
+        name = mnemonic.mnemonic_identifier
+        cache_file = os.path.join(self.cache_dir, f'{name}.npz')
+
+        dates = np.array(mnemonic.dates, dtype='datetime64[us]')
+        values = np.asarray(mnemonic.values)
+        coverage = np.array([datetime64_from_time(mnemonic.requested_start_time),
+                             datetime64_from_time(mnemonic.requested_end_time)])
+
+        if os.path.isfile(cache_file):
+            with np.load(cache_file, allow_pickle=False) as cache:
+                old_coverage = cache["coverage"]
+                if coverage[0] <= old_coverage[1] and coverage[1] >= old_coverage[0]:
+                    dates = np.concatenate([cache["dates"], dates])
+                    values = np.concatenate([cache["euvalues"], values])
+                    coverage = np.array([min(coverage[0], old_coverage[0]), max(coverage[1], old_coverage[1])])
+
+        # Sort by date and remove duplicates. np.unique returns the sorted unique dates
+        dates, unique_idx = np.unique(dates, return_index=True)
+        values = values[unique_idx]
+
+        # Write to a temporary file first, so that an interrupted write does not
+        # leave a corrupted cache behind
+        temp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_file, 'wb') as fobj:
+            np.savez(fobj, dates=dates, euvalues=values, coverage=coverage, change_only=mnemonic.change_only,
+                     meta=json.dumps(mnemonic.meta, default=str), info=json.dumps(mnemonic.info, default=str))
+        os.replace(temp_file, cache_file)
+        logging.info(f'Cached {len(dates)} points for {name} in {cache_file}')
+
 
 def add_every_change_history(dict1, dict2):
     """Combine two dictionaries that contain every change data. For keys that are
@@ -1862,6 +2522,44 @@ def calculate_statistics(mnemonic_instance, telemetry_type):
     return mnemonic_instance
 
 
+def concatenate_chunks(chunks):
+    """Concatenate a list of arrays or lists into a single array. Empty
+    chunks are skipped, so that they do not affect the output dtype.
+
+    Parameters
+    ----------
+    chunks : list
+        List of arrays or lists
+
+    Returns
+    -------
+    combined : numpy.ndarray
+        Concatenated array. Empty if all chunks are empty.
+    """
+    chunks = [np.asarray(chunk) for chunk in chunks if len(chunk) > 0]
+    if len(chunks) == 0:
+        return np.array([])
+    return np.concatenate(chunks)
+
+
+def datetime64_from_time(time_obj):
+    """Convert a datetime or astropy Time object to numpy.datetime64
+
+    Parameters
+    ----------
+    time_obj : datetime.datetime or astropy.time.Time
+        Time to convert
+
+    Returns
+    -------
+    dt64 : numpy.datetime64
+        Time as a datetime64 object with microsecond resolution
+    """
+    if isinstance(time_obj, Time):
+        time_obj = time_obj.datetime
+    return np.datetime64(time_obj, 'us')
+
+
 def define_options(parser=None, usage=None, conflict_handler='resolve'):
     if parser is None:
         parser = argparse.ArgumentParser(usage=usage, conflict_handler=conflict_handler)
@@ -1869,6 +2567,7 @@ def define_options(parser=None, usage=None, conflict_handler='resolve'):
     parser.add_argument('--mnem_to_query', type=str, default=None, help='Mnemonic to query for')
     parser.add_argument('--plot_start', type=str, default=None, help='Start time for EDB monitor query. Expected format: "2022-10-31"')
     parser.add_argument('--plot_end', type=str, default=None, help='End time for EDB monitor query. Expected format: "2022-10-31"')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes used to process mnemonics in parallel')
     return(parser)
 
 
@@ -1922,6 +2621,40 @@ def ensure_list(var):
         return var
 
 
+def multiday_query_worker(state, mnemonic_dict, starting_time_list, ending_time_list, telemetry_type):
+    """Run ``EdbMnemonicMonitor.multiday_mnemonic_query`` in a worker process.
+
+    Parameters
+    ----------
+    state : dict
+        Attributes of the parent ``EdbMnemonicMonitor`` instance needed for the query
+
+    mnemonic_dict : dict
+        Dictionary of information for a single mnemonic
+
+    starting_time_list : list
+        List of datetime values indicating beginning query times
+
+    ending_time_list : list
+        List of datetime values indicating the end time of each query
+
+    telemetry_type : str
+        Type of telemetry being retrieved
+
+    Returns
+    -------
+    all_data : jwql.edb.engineering_database.EdbMnemonic
+        EDBMnemonic instance containing the mnemonic's filtered, averaged data
+    """
+    # Do not share the parent process's connection to the EDB service
+    ed.clear_engdb_services()
+
+    monitor = EdbMnemonicMonitor()
+    for key, value in state.items():
+        setattr(monitor, key, value)
+    return monitor.multiday_mnemonic_query(mnemonic_dict, starting_time_list, ending_time_list, telemetry_type)
+
+
 def organize_every_change(mnemonic):
     """Given an EdbMnemonic instance containing every_change data,
     organize the information such that there are single 1d arrays
@@ -2068,7 +2801,8 @@ def plot_every_change_data(data, mnem_name, units, show_plot=False, savefig=True
 
     # Create figure
     fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type='datetime',
-                 title=title, x_axis_label='Time', y_axis_label=f'{units}')
+                 title=title, x_axis_label='Time', y_axis_label=f'{units}', output_backend='webgl',
+                 lod_threshold=2000)
 
     if savefig:
         filename = os.path.join(out_dir, f"telem_plot_{mnem_name.replace(' ', '_')}.html")
@@ -2179,6 +2913,28 @@ def plot_every_change_data(data, mnem_name, units, show_plot=False, savefig=True
         return fig
 
 
+def related_mnemonics(mnemonic_dict):
+    """Return the names of all mnemonics that must be retrieved from the EDB in order
+    to process the given mnemonic: the mnemonic itself, the mnemonic it is multiplied
+    by (if any), and its dependencies.
+
+    Parameters
+    ----------
+    mnemonic_dict : dict
+        Dictionary of information for a single mnemonic
+
+    Returns
+    -------
+    names : list
+        Unique mnemonic names
+    """
+    names = [mnemonic_dict["name"]]
+    if '*' in mnemonic_dict["plot_data"]:
+        names.append(mnemonic_dict["plot_data"].split(',')[0].strip('*'))
+    names.extend([dep["name"] for dep in mnemonic_dict["dependency"]])
+    return list(dict.fromkeys(names))
+
+
 if __name__ == '__main__':
     module = os.path.basename(__file__).strip('.py')
     start_time, log_file = monitor_utils.initialize_instrument_monitor(module)
@@ -2194,5 +2950,5 @@ if __name__ == '__main__':
         plot_end_dt = datetime.datetime.strptime(args.plot_end, '%Y-%m-%d')
 
     monitor = EdbMnemonicMonitor()
-    monitor.execute(args.mnem_to_query, plot_start_dt, plot_end_dt)
+    monitor.execute(args.mnem_to_query, plot_start_dt, plot_end_dt, workers=args.workers)
     monitor_utils.update_monitor_table(module, start_time, log_file)
@@ -47,6 +47,16 @@ Use
 from astropy.table import Table
 from copy import deepcopy  # only needed for development
 import numpy as np
+import operator
+
+# Map each allowed relation to the functions that test the relation and its opposite
+RELATIONS = {'>': (operator.gt, operator.le),
+             '<': (operator.lt, operator.ge),
+             '==': (operator.eq, operator.ne),
+             '!=': (operator.ne, operator.eq),
+             '<=': (operator.le, operator.gt),
+             '>=': (operator.ge, operator.lt)
+             }
 
 
 class condition:
@@ -110,11 +120,16 @@ class condition:
         of mnemonic falls within one time interval of all conditions
         tf = tf1_flat & tf2_flat & tf3_flat
         """
-        # 2D matrix to hold boolean values for all conditions
-        tf_matrix = np.zeros((len(self.cond_set), len(mnemonic["dates"]))).astype(bool)
+        # The mnemonic's dates are sorted, so the elements falling within each good time
+        # block form a contiguous slice, whose boundaries can be found with a binary search.
+        # A single boolean mask is updated in place for all conditions, so that if the
+        # mnemonic's time falls within a good time block for all of the conditions,
+        # then it is considered good.
+        dates = np.asarray(mnemonic["dates"])
+        tf = np.ones(len(dates), dtype=bool)
 
         # Loop over conditions
-        for i, cond in enumerate(self.cond_set):
+        for cond in self.cond_set:
             # Check if any of the time pairs include None, which indicates no good data
             if None in cond.time_pairs[0]:
                 self.extracted_data = Table()
@@ -122,33 +137,23 @@ class condition:
                 self.extracted_data['euvalues'] = []
                 self.block_indexes = [0, 0]
                 return Table(names=('dates', 'euvalues')), None
-            else:
-                # Find whether each mnemonic time falls within each of the good time blocks
-                tf_cond = [((mnemonic["dates"].data >= times[0]) & (mnemonic["dates"].data <= times[1])) for times in cond.time_pairs]
-
-                if len(tf_cond) > 1:
-                    # If there are multiple blocks of good time pairs, combine them
-                    # into a 2D array (rather than list)
-                    tf_2d = np.zeros((len(tf_cond), len(tf_cond[1]))).astype(bool)
-                    for index in range(len(tf_cond)):
-                        tf_2d[index, :] = tf_cond[index]
-
-                    # Flatten the 2D boolean array. If the mnemonic's time falls within any of
-                    # the good time pairs, it should be True here
-                    tf_flat = np.any(tf_2d, axis=0)
-                elif len(tf_cond) == 1:
-                    # If there is only one block of good times, then no need to create
-                    # a 2D array and flatten
-                    tf_flat = np.array(tf_cond)
-                else:
-                    raise ValueError(f"tf_cond has a length of {len(tf_cond)}, which is not expected.")
-
-                # Create a 2D boolean matrix that will hold the T/F values for all conditions
-                tf_matrix[i, :] = tf_flat
-
-        # Finally, if the mnemonic's time falls within a good time block for all of the
-        # conditions, then it is considered good.
-        tf = np.all(tf_matrix, axis=0)
+
+            if len(cond.time_pairs) == 0:
+                raise ValueError("Condition contains no time pairs, which is not expected.")
+
+            # Find the slice of the mnemonic data within each of the good time blocks.
+            # Mark the start and end of each slice, and use a cumulative sum to find the
+            # elements that fall within any of the good time blocks.
+            starts, ends = zip(*cond.time_pairs)
+            first = np.searchsorted(dates, np.array(starts), side='left')
+            last = np.searchsorted(dates, np.array(ends), side='right')
+            nonempty = first < last
+            first = first[nonempty]
+            last = last[nonempty]
+            edges = np.zeros(len(dates) + 1, dtype=int)
+            np.add.at(edges, first, 1)
+            np.add.at(edges, last, -1)
+            tf &= np.cumsum(edges[0:-1]) > 0
 
         # Extract the good data and save it in an array
         good_data = Table()
@@ -162,29 +167,19 @@ class condition:
         # Save tuples of (start_time, end_time) for blocks.
         # Save those in self.block_indexes below.
 
-        # Add a False 0th element
-        tf_plus_false = np.insert(tf, 0, False)
-
-        # Now we need to find the indexes where the array switches from False to True.
-        # These will be the starting indexes of the blocks. (Remember to subtract 1 in
-        # order to account for the added False element)
-        switches = tf_plus_false.astype(int)[0:-1] - tf.astype(int)
-        switch_to_true = np.where(switches == -1)[0]
-        switch_to_false = np.where(switches == 1)[0]
+        # Find the indexes where the array switches from False to True (+1) and from
+        # True to False (-1). The former are the starting indexes of the blocks. A single
+        # int8 buffer holds the differences, with an implicit False before the 0th element.
+        switches = np.diff(tf.astype(np.int8), prepend=np.int8(0))
+        switch_to_true = np.flatnonzero(switches == 1)
+        switch_to_false = np.flatnonzero(switches == -1)
 
         # These indexes apply to the original data. Once we extract the good
-        # data using tf, we now need to adjust these indexes so that they
-        # apply to the extracted data.
-        filtered_indexes = []
-        for i in range(len(switch_to_true)):
-            if i == 0:
-                diff = switch_to_true[i]
-            else:
-                diff = switch_to_true[i] - switch_to_false[i - 1]
-            switch_to_true -= diff
-            switch_to_false -= diff
-            filtered_indexes.append(switch_to_true[i])
-        self.block_indexes = filtered_indexes
+        # data using tf, each block starts at the total length of the blocks
+        # before it.
+        block_lengths = switch_to_false - switch_to_true[0:len(switch_to_false)]
+        filtered_indexes = np.concatenate(([0], np.cumsum(block_lengths)))[0:len(switch_to_true)]
+        self.block_indexes = filtered_indexes.tolist()
 
         # Add the index of the final element if it's not there already
         if len(self.block_indexes) > 0:
@@ -316,26 +311,16 @@ class relation_test():
             List of 2-tuples where each tuple contains the starting and
             ending times of a block of data that matches the condition
         """
-        if self.rel == '>':
-            opp = '<='
-        elif self.rel == '<':
-            opp = '>='
-        elif self.rel == '==':
-            opp = '!='
-        elif self.rel == '!=':
-            opp = '=='
-        elif self.rel == '<=':
-            opp = '>'
-        elif self.rel == '>=':
-            opp = '<'
-        else:
+        if self.rel not in RELATIONS:
             raise ValueError(f'Unrecognized relation: {self.rel}')
+        relation, opposite = RELATIONS[self.rel]
 
-        good_points = eval(f'np.where(self.mnemonic["euvalues"] {self.rel} self.value)[0]')
-        bad_points = eval(f'np.where(self.mnemonic["euvalues"] {opp} self.value)[0]')
-
-        good_time_values = self.mnemonic["dates"][good_points]
-        bad_time_values = self.mnemonic["dates"][bad_points]
+        # Boolean masks select the good and bad points directly, without first
+        # converting them into lists of indexes
+        values = np.asarray(self.mnemonic["euvalues"])
+        dates = np.asarray(self.mnemonic["dates"])
+        good_time_values = dates[relation(values, self.value)]
+        bad_time_values = dates[opposite(values, self.value)]
 
         time_pairs = self.generate_time_pairs(good_time_values, bad_time_values)
         return time_pairs
@@ -366,8 +351,9 @@ class relation_test():
             List of 2-tuples, where each tuple contains the starting and ending
             time where the condition is True.
         """
-        good_times = list(sorted(set(good_times)))
-        bad_times = list(sorted(set(bad_times)))
+        # np.unique returns the sorted set of times
+        good_times = np.unique(good_times)
+        bad_times = np.unique(bad_times)
 
         # Take care of the easy cases, where all times are good or all are bad
         if len(bad_times) == 0:
@@ -383,45 +369,22 @@ class relation_test():
                 return [(None, None)]
 
         # Now the case where there are both good and bad input times
-        # Combine and sort the good and bad times lists
-        all_times = np.array(good_times + bad_times)
-        sort_idx = np.argsort(all_times)
+        # Combine and sort the good and bad times, along with a matching boolean
+        # array marking which times are good
+        all_times = np.concatenate((good_times, bad_times))
+        all_vals = np.concatenate((np.ones(len(good_times), dtype=bool), np.zeros(len(bad_times), dtype=bool)))
+        sort_idx = np.argsort(all_times, kind='stable')
         all_times = all_times[sort_idx]
-
-        # Create boolean arrays to match the time arrays. Combine in the same
-        # way as the good and bad time lists above.
-        good = [True] * len(good_times)
-        bad = [False] * len(bad_times)
-        all_vals = np.array(good + bad)
         all_vals = all_vals[sort_idx]
 
-        # Find the indexes where the value switches from one element to the next
-        a_change_indexes = np.where(all_vals[:-1] != all_vals[1:])[0]
-        change_indexes = a_change_indexes + 1
-        change_indexes = np.insert(change_indexes, 0, 0)
-        change_len = len(change_indexes) + 1
-
-        # Now create tuples of the start and end times where the values change
-        # We need to know if the first element of the data is True or False,
-        # in order to get the index counters correct below.
-        if all_vals[0]:
-            start_idx = 0
-            counter_delta = 0
-        else:
-            start_idx = 1
-            counter_delta = 1
-
-        # We need to loop over EVERY OTHER change index, so that in the end we have a list
-        # of tuples of only the good_times. i.e. we need to skip the blocks corresponding to
-        # the bad_times.
-        good_blocks = []
-        for counti, strt in enumerate(change_indexes[start_idx:len(change_indexes):2]):
-            i = counti * 2 + counter_delta
-            if i < (len(change_indexes) - 1):
-                good_blocks.append((all_times[strt], all_times[change_indexes[i + 1] - 1]))
-            else:
-                good_blocks.append((all_times[strt], all_times[-1]))
+        # Find the indexes where the values switch from False to True (+1) and from True
+        # to False (-1), with an implicit False before the first and after the last element.
+        # These mark the first and (one past the) last elements of each block of good times.
+        switches = np.diff(all_vals.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+        block_starts = np.flatnonzero(switches == 1)
+        block_ends = np.flatnonzero(switches == -1) - 1
 
+        good_blocks = list(zip(all_times[block_starts], all_times[block_ends]))
         return good_blocks
 
 
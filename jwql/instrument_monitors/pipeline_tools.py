@@ -333,6 +333,34 @@ def calwebb_detector1_save_jump(input_file, output_dir, ramp_fit=True, save_fito
     """
     input_file_only = os.path.basename(input_file)
 
+    # Check to see which of the requested files are already present, before
+    # doing any of the (comparatively expensive) pipeline setup
+    jump_output = os.path.join(output_dir, input_file_only.replace('uncal', 'jump'))
+    run_jump = not os.path.isfile(jump_output)
+
+    if ramp_fit:
+        # pipe_output = os.path.join(output_dir, input_file_only.replace('uncal', 'rate'))
+        pipe_output = os.path.join(output_dir, input_file_only.replace('uncal', '0_ramp_fit'))
+        run_slope = not os.path.isfile(pipe_output)
+        if save_fitopt:
+            fitopt_output = os.path.join(output_dir, input_file_only.replace('uncal', 'fitopt'))
+            run_fitopt = not os.path.isfile(fitopt_output)
+        else:
+            fitopt_output = None
+            run_fitopt = False
+    else:
+        pipe_output = None
+        fitopt_output = None
+        run_slope = False
+        run_fitopt = False
+
+    # Only call the pipeline if any of the files at the requested calibration
+    # states are not present in the output directory
+    if not (run_jump or (ramp_fit and run_slope) or (save_fitopt and run_fitopt)):
+        print(("Files with all requested calibration states for {} already present in "
+               "output directory. Skipping pipeline call.".format(input_file)))
+        return jump_output, pipe_output, fitopt_output
+
     # Find the instrument used to collect the data
     datamodel = datamodels.RampModel(input_file)
     instrument = datamodel.meta.instrument.name.lower()
@@ -368,41 +396,16 @@ def calwebb_detector1_save_jump(input_file, output_dir, ramp_fit=True, save_fito
 
     model.jump.save_results = True
     model.jump.output_dir = output_dir
-    jump_output = os.path.join(output_dir, input_file_only.replace('uncal', 'jump'))
-
-    # Check to see if the jump version of the requested file is already
-    # present
-    run_jump = not os.path.isfile(jump_output)
 
     if ramp_fit:
         model.ramp_fit.save_results = True
         # model.save_results = True
         model.output_dir = output_dir
-        # pipe_output = os.path.join(output_dir, input_file_only.replace('uncal', 'rate'))
-        pipe_output = os.path.join(output_dir, input_file_only.replace('uncal', '0_ramp_fit'))
-        run_slope = not os.path.isfile(pipe_output)
-        if save_fitopt:
-            model.ramp_fit.save_opt = True
-            fitopt_output = os.path.join(output_dir, input_file_only.replace('uncal', 'fitopt'))
-            run_fitopt = not os.path.isfile(fitopt_output)
-        else:
-            model.ramp_fit.save_opt = False
-            fitopt_output = None
-            run_fitopt = False
+        model.ramp_fit.save_opt = save_fitopt
     else:
         model.ramp_fit.skip = True
-        pipe_output = None
-        fitopt_output = None
-        run_slope = False
-        run_fitopt = False
 
-    # Call the pipeline if any of the files at the requested calibration
-    # states are not present in the output directory
-    if run_jump or (ramp_fit and run_slope) or (save_fitopt and run_fitopt):
-        model.run(datamodel)
-    else:
-        print(("Files with all requested calibration states for {} already present in "
-               "output directory. Skipping pipeline call.".format(input_file)))
+    model.run(datamodel)
 
     return jump_output, pipe_output, fitopt_output
 
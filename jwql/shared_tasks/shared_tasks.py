@@ -16,11 +16,12 @@ wasteful in terms of time and resources. If a task covers *both* cases, then it
 particularly useful.
 
 Because multiple monitors may be running at the same time, and may need the same task
-performed, and because running the same task multiple times would be as wasteful as just
-having each monitor run it independently, the celery-singleton module is used to require
-task uniqueness. This is transparent to the monitors involved, as a duplicate task will be
-given the same AsyncResult object as the existing task asking for the same resource, so
-the monitor can simply proceed as if it were the only one requesting the task.
+performed, the convenience functions below take a redis lock on the name of each file
+before dispatching its task, and hold it until the outputs have been retrieved. A second
+request for the same file waits for the lock, so the same file is never calibrated by two
+tasks at once, and the two requests can't overwrite each other's files in the transfer
+directories. This is transparent to the monitors involved, which can simply proceed as if
+they were the only one requesting the task.
 
 Author
 ------
@@ -74,7 +75,6 @@ from astropy.io import fits
 from collections import OrderedDict
 from copy import deepcopy
 import gc
-from glob import glob
 import json
 import logging
 from logging import FileHandler, StreamHandler
@@ -110,17 +110,33 @@ from jwql.utils.utils import copy_files, ensure_dir_exists, get_config, filesyst
 
 from celery import Celery
 from celery.app.log import TaskFormatter
+from celery.result import ResultSet
 from celery.signals import after_setup_logger, after_setup_task_logger, task_postrun
 from celery.utils.log import get_task_logger
 
+# Read the config file once, when the module is imported, rather than every time a task
+# needs one of its entries. Note that this means that celery workers must be restarted
+# to pick up changes to the config file.
 try:
-    REDIS_HOST = get_config()["redis_host"]
-    REDIS_PORT = get_config()["redis_port"]
+    JWQL_CONFIG = get_config()
+    REDIS_HOST = JWQL_CONFIG["redis_host"]
+    REDIS_PORT = JWQL_CONFIG["redis_port"]
+    TRANSFER_DIR = JWQL_CONFIG["transfer_dir"]
+    WORKING_DIR = JWQL_CONFIG["working"]
+    CAL_DIR = os.path.join(WORKING_DIR, "calibrated_data")
 except FileNotFoundError as e:
+    JWQL_CONFIG = None
     REDIS_HOST = "127.0.0.1"
     REDIS_PORT = "6379"
+    TRANSFER_DIR = None
+    WORKING_DIR = None
+    CAL_DIR = None
 REDIS_URL = "redis://{}:{}".format(REDIS_HOST, REDIS_PORT)
-REDIS_CLIENT = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+# Connections are kept alive and re-used for the life of the process, rather than being
+# opened for each lock operation. redis-py resets the pool in forked worker processes.
+REDIS_POOL = redis.ConnectionPool(host=REDIS_HOST, port=REDIS_PORT, max_connections=32, socket_keepalive=True,
+                                  health_check_interval=30)
+REDIS_CLIENT = redis.Redis(connection_pool=REDIS_POOL)
 
 # Okay, let's explain these options:
 #   - the first argument ('shared_tasks') is the task queue to listen to. We only have one,
@@ -128,7 +144,11 @@ REDIS_CLIENT = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
 #     (workers) need to use the same queue so that the workers are taking tasks from the
 #     same place that the monitors are putting them.
 #   - the broker is the server that keeps track of tasks and task IDs. redis does this
-#   - the backend is the server that keeps track of events. redis does this too
+#   - the backend is the server that keeps track of events. redis does this too. The redis
+#     result backend publishes each task's result on a pub/sub channel, and a client waiting
+#     in result.get() subscribes to that channel, so waiting for a result does not poll
+#     redis. This is the default for the redis backend. Don't add options (for example
+#     result_backend_always_retry) that would need to be checked against that behaviour.
 #   - worker_mask_tasks_per_child is how many tasks a process can run before it gets
 #     restarted and replaced. This is set to 1 because the pipeline has memory leaks.
 #   - worker_prefetch_multiplier is how many tasks a worker can reserve for itself at a
@@ -171,7 +191,7 @@ def only_one(function=None, key="", timeout=None):
                     logging.warning("Lock {} is already in use.".format(key))
                     msg = "If you believe that this is a stale lock, log in to {}"
                     msg += " and enter 'redis-cli del {}'"
-                    logging.warning(msg.format(get_config()['redis_host'], key))
+                    logging.warning(msg.format(REDIS_HOST, key))
             finally:
                 if have_lock:
                     lock.release()
@@ -185,7 +205,7 @@ def only_one(function=None, key="", timeout=None):
 
 def create_task_log_handler(logger, propagate):
     log_file_name = configure_logging('shared_tasks')
-    working_dir = os.path.join(get_config()['working'], 'calibrated_data')
+    working_dir = CAL_DIR
     ensure_dir_exists(working_dir)
     celery_log_file_handler = FileHandler(log_file_name)
     logger.addHandler(celery_log_file_handler)
@@ -256,6 +276,51 @@ def convert_step_args_to_string(args_dict):
     return args_str
 
 
+def files_with_prefix(directory, prefix):
+    """Return the files in a directory whose names begin with the given prefix.
+    This is equivalent to ``glob(os.path.join(directory, prefix + "*"))``, but
+    uses a plain string comparison on a single directory listing rather than
+    pattern matching each name.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to search
+
+    prefix : str
+        Beginning of the file names to return
+
+    Returns
+    -------
+    files : list
+        Full paths of the matching files
+    """
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries if entry.name.startswith(prefix) and not entry.name.startswith('.')]
+
+
+def publish_file(input_file, out_dir):
+    """Make a calibrated file available in the outgoing transfer directory. The
+    local copy of the file is deleted once the task has finished, so if the two
+    directories are on the same filesystem, the file is hard linked into place
+    rather than copied. Otherwise (or if the file is already present), fall back
+    to ``copy_files``.
+
+    Parameters
+    ----------
+    input_file : str
+        File to publish
+
+    out_dir : str
+        Destination directory
+    """
+    try:
+        os.link(input_file, os.path.join(out_dir, os.path.basename(input_file)))
+    except OSError:
+        # e.g. EXDEV if the directories are on different filesystems
+        copy_files([input_file], out_dir)
+
+
 def run_subprocess(name, cmd, outputs, cal_dir, ins, in_file, short_name, res_file, cores, step_args):
     # Convert step_args dictionary to a string so that it can be passed via command line.
     # For some reason, json.dumps() doesn't seem to work correctly, so we use a custom function.
@@ -318,13 +383,12 @@ def run_calwebb_detector1(input_file_name, short_name, ext_or_exts, instrument,
     """
     msg = "Starting {} calibration task for {}"
     logging.info(msg.format(instrument, input_file_name))
-    config = get_config()
     if isinstance(ext_or_exts, str):
         ext_or_exts = [ext_or_exts]
 
-    input_dir = os.path.join(config['transfer_dir'], "incoming")
-    cal_dir = os.path.join(config['working'], "calibrated_data")
-    output_dir = os.path.join(config['transfer_dir'], "outgoing")
+    input_dir = os.path.join(TRANSFER_DIR, "incoming")
+    cal_dir = CAL_DIR
+    output_dir = os.path.join(TRANSFER_DIR, "outgoing")
     msg = "Input from {}, calibrate in {}, output to {}"
     logging.info(msg.format(input_dir, cal_dir, output_dir))
 
@@ -396,11 +460,11 @@ def run_calwebb_detector1(input_file_name, short_name, ext_or_exts, instrument,
             logging.error("ERROR: {} not found".format(file))
             raise FileNotFoundError(file)
         logging.info("Copying output file {}".format(file))
-        copy_files([os.path.join(cal_dir, file)], output_dir)
+        publish_file(os.path.join(cal_dir, file), output_dir)
         set_permissions(os.path.join(output_dir, file))
 
     logging.info("Removing local files.")
-    files_to_remove = glob(os.path.join(cal_dir, short_name + "*"))
+    files_to_remove = files_with_prefix(cal_dir, short_name)
     for file_name in files_to_remove:
         logging.info("\tRemoving {}".format(file_name))
         os.remove(file_name)
@@ -454,11 +518,10 @@ def calwebb_detector1_save_jump(input_file_name, instrument, ramp_fit=True, save
     """
     msg = "Started Save Jump Task on {}. ramp_fit={}, save_fitopt={}"
     logging.info(msg.format(input_file_name, ramp_fit, save_fitopt))
-    config = get_config()
 
-    input_dir = os.path.join(config["transfer_dir"], "incoming")
-    cal_dir = os.path.join(config['working'], "calibrated_data")
-    output_dir = os.path.join(config['transfer_dir'], "outgoing")
+    input_dir = os.path.join(TRANSFER_DIR, "incoming")
+    cal_dir = CAL_DIR
+    output_dir = os.path.join(TRANSFER_DIR, "outgoing")
     msg = "Input from {}, calibrate in {}, output to {}"
     logging.info(msg.format(input_dir, cal_dir, output_dir))
 
@@ -470,7 +533,7 @@ def calwebb_detector1_save_jump(input_file_name, instrument, ramp_fit=True, save
     parts = input_file_name.split('_')
     short_name = f'{parts[0]}_{parts[1]}_{parts[2]}_{parts[3]}'
     ensure_dir_exists(cal_dir)
-    output_dir = os.path.join(config["transfer_dir"], "outgoing")
+    output_dir = os.path.join(TRANSFER_DIR, "outgoing")
 
     cmd_name = os.path.join(os.path.dirname(__file__), "run_pipeline.py")
     result_file = os.path.join(cal_dir, short_name + "_status.txt")
@@ -522,7 +585,7 @@ def calwebb_detector1_save_jump(input_file_name, instrument, ramp_fit=True, save
         if not os.path.isfile(os.path.join(cal_dir, file)):
             logging.error("WARNING: {} not found".format(file))
         else:
-            copy_files([os.path.join(cal_dir, file)], output_dir)
+            publish_file(os.path.join(cal_dir, file), output_dir)
             set_permissions(os.path.join(output_dir, file))
             if "jump" in file:
                 files["jump_output"] = os.path.join(output_dir, file)
@@ -532,7 +595,7 @@ def calwebb_detector1_save_jump(input_file_name, instrument, ramp_fit=True, save
                 files["fitopt_output"] = os.path.join(output_dir, file)
 
     logging.info("Removing local files.")
-    files_to_remove = glob(os.path.join(cal_dir, short_name + "*"))
+    files_to_remove = files_with_prefix(cal_dir, short_name)
     for file_name in files_to_remove:
         logging.info("\tRemoving {}".format(file_name))
         os.remove(file_name)
@@ -570,10 +633,9 @@ def prep_file(input_file, in_ext):
     input_name : str
         The raw file to be calibrated
     """
-    config = get_config()
-    send_path = os.path.join(config["transfer_dir"], "incoming")
+    send_path = os.path.join(TRANSFER_DIR, "incoming")
     ensure_dir_exists(send_path)
-    receive_path = os.path.join(config["transfer_dir"], "outgoing")
+    receive_path = os.path.join(TRANSFER_DIR, "outgoing")
     ensure_dir_exists(receive_path)
 
     input_path, input_name = os.path.split(input_file)
@@ -597,7 +659,7 @@ def prep_file(input_file, in_ext):
     return short_name, cal_lock, os.path.join(send_path, input_name)
 
 
-def start_pipeline(input_file, short_name, ext_or_exts, instrument, jump_pipe=False, step_args={}):
+def start_pipeline(input_file, short_name, ext_or_exts, instrument, jump_pipe=False, step_args={}, producer=None):
     """Starts the standard or save_jump pipeline for the provided file.
 
     .. warning::
@@ -639,6 +701,11 @@ def start_pipeline(input_file, short_name, ext_or_exts, instrument, jump_pipe=Fa
         are the step names (as seen in pipeline_tools.PIPELINE_STEP_MAPPING). Each value is a
         dictionary of keyword value pairs that are relevant for that step.
 
+    producer : kombu.Producer
+        Producer used to send the task to the broker. If None, one is acquired from the
+        celery app's producer pool. Passing the same producer when starting many tasks
+        avoids acquiring a broker connection for each of them.
+
     Returns
     -------
     result : celery.result.AsyncResult
@@ -654,9 +721,12 @@ def start_pipeline(input_file, short_name, ext_or_exts, instrument, jump_pipe=Fa
                 ramp_fit = True
             elif "fitopt" in ext:
                 save_fitopt = True
-        result = calwebb_detector1_save_jump.delay(input_file, instrument, ramp_fit=ramp_fit, save_fitopt=save_fitopt, step_args=step_args)
+        result = calwebb_detector1_save_jump.apply_async((input_file, instrument),
+                                                         dict(ramp_fit=ramp_fit, save_fitopt=save_fitopt, step_args=step_args),
+                                                         producer=producer)
     else:
-        result = run_calwebb_detector1.delay(input_file, short_name, ext_or_exts, instrument, step_args=step_args)
+        result = run_calwebb_detector1.apply_async((input_file, short_name, ext_or_exts, instrument),
+                                                   dict(step_args=step_args), producer=producer)
     return result
 
 
@@ -686,10 +756,9 @@ def retrieve_files(short_name, ext_or_exts, dest_dir):
     """
     if isinstance(ext_or_exts, dict):
         ext_or_exts = ext_or_exts[short_name]
-    config = get_config()
-    send_path = os.path.join(config["transfer_dir"], "incoming")
+    send_path = os.path.join(TRANSFER_DIR, "incoming")
     ensure_dir_exists(send_path)
-    receive_path = os.path.join(config["transfer_dir"], "outgoing")
+    receive_path = os.path.join(TRANSFER_DIR, "outgoing")
     ensure_dir_exists(receive_path)
 
     if isinstance(ext_or_exts, str):
@@ -700,7 +769,7 @@ def retrieve_files(short_name, ext_or_exts, dest_dir):
     logging.info("\t\tCopying {} to {}".format(file_or_files, dest_dir))
     copy_files([os.path.join(receive_path, x) for x in file_or_files], dest_dir)
     logging.info("\t\tClearing Transfer Files")
-    to_clear = glob(os.path.join(send_path, short_name + "*")) + glob(os.path.join(receive_path, short_name + "*"))
+    to_clear = files_with_prefix(send_path, short_name) + files_with_prefix(receive_path, short_name)
     for file in to_clear:
         os.remove(file)
     if len(output_file_or_files) == 1:
@@ -820,6 +889,7 @@ def run_parallel_pipeline(input_files, in_ext, ext_or_exts, instrument, jump_pip
         logging.info("\tCalibrating {}".format(input_file))
 
     input_file_paths = {}
+    uncal_names = {}
     results = {}
     locks = {}
     outputs = {}
@@ -831,24 +901,40 @@ def run_parallel_pipeline(input_files, in_ext, ext_or_exts, instrument, jump_pip
             retrieve_dir = os.path.dirname(input_file)
             logging.info("\tPipeline call for {} requesting {} sent to {}".format(input_file, ext_or_exts, retrieve_dir))
             short_name, cal_lock, uncal_file = prep_file(input_file, in_ext)
-            uncal_name = os.path.basename(uncal_file)
             output_dirs[short_name] = retrieve_dir
             input_file_paths[short_name] = input_file
             locks[short_name] = cal_lock
-            results[short_name] = start_pipeline(uncal_name, short_name, ext_or_exts, instrument, jump_pipe=jump_pipe, step_args=step_args)
-            logging.info("\tStarting {} with ID {}".format(short_name, results[short_name].id))
+            uncal_names[short_name] = os.path.basename(uncal_file)
+
+        # Send all of the tasks through a single producer, so that one broker connection
+        # is used for the whole batch
+        with celery_app.producer_or_acquire() as producer:
+            for short_name in uncal_names:
+                results[short_name] = start_pipeline(uncal_names[short_name], short_name, ext_or_exts, instrument,
+                                                     jump_pipe=jump_pipe, step_args=step_args, producer=producer)
+                logging.info("\tStarting {} with ID {}".format(short_name, results[short_name].id))
         logging.info("Celery tasks submitted.")
         logging.info("Waiting for task results")
-        for short_name in results:
+
+        # Handle the results in the order in which the tasks finish, rather than the order in
+        # which they were submitted, so that the outputs of finished tasks are copied while
+        # other tasks are still running. Failed tasks are passed to the callback with their
+        # exception as the value.
+        short_names = {results[short_name].id: short_name for short_name in results}
+
+        def collect_result(task_id, value):
+            short_name = short_names[task_id]
             try:
-                logging.info("\tWaiting for {} ({})".format(short_name, results[short_name].id))
-                processed_path = results[short_name].get()
+                if isinstance(value, Exception):
+                    raise value
                 logging.info("\t{} retrieved".format(short_name))
                 outputs[input_file_paths[short_name]] = retrieve_files(short_name, ext_or_exts, output_dirs[short_name])
                 logging.info("\tFiles copied for {}".format(short_name))
             except Exception as e:
                 logging.error('\tPipeline processing failed for {}'.format(short_name))
                 logging.error('\tProcessing raised {}'.format(e))
+
+        ResultSet(list(results.values())).join_native(propagate=False, callback=collect_result)
         logging.info("Finished retrieving results")
     finally:
         logging.info("Releasing locks")
@@ -26,6 +26,7 @@ import astropy.units as u
 from datetime import datetime, timedelta
 import numpy as np
 import pytest
+import threading
 
 from jwql.edb import engineering_database as ed
 from jwql.utils.constants import ON_GITHUB_ACTIONS
@@ -61,6 +62,49 @@ def test_add():
     assert added.info['unit'] == 'V'
 
 
+def test_block_stats():
+    """Test that statistics are calculated separately for each block of data"""
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
+    data = np.array([5., 5., 5., 9., 9., 9., 9., 9., 2., 2.])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = data
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:30:00'), tab, {}, {},
+                              blocks=[0, 3, 3, 8, 10])
+    mnemonic.meta = {'Count': 1,
+                     'TlmMnemonics': [{'TlmMnemonic': 'SOMETHING',
+                                       'AllPoints': 1}]}
+    mnemonic.block_stats()
+    assert np.all(mnemonic.mean == np.array([5., 9., 2.]))
+    assert np.all(mnemonic.median == np.array([5., 9., 2.]))
+    assert np.all(mnemonic.stdev == np.array([0., 0., 0.]))
+    assert np.all(mnemonic.max == np.array([5., 9., 2.]))
+    assert mnemonic.median_times == [datetime(2021, 12, 18, 7, 21, 0), datetime(2021, 12, 18, 7, 25, 0),
+                                     datetime(2021, 12, 18, 7, 28, 30)]
+
+
+def test_block_stats_nan():
+    """Test that NaNs in the data are treated as in the per-block calculation,
+    rather than being dropped along with the padding of the blocks
+    """
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
+    data = np.array([5., 5., 5., 9., np.nan, 9., 9., 9., 2., 2.])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = data
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:30:00'), tab, {}, {},
+                              blocks=[0, 3, 8, 10])
+    mnemonic.meta = {'Count': 1,
+                     'TlmMnemonics': [{'TlmMnemonic': 'SOMETHING',
+                                       'AllPoints': 1}]}
+    mnemonic.block_stats()
+    assert np.all(mnemonic.mean == np.array([5., 9., 2.]))
+    assert np.all(mnemonic.median == np.array([5., 9., 2.]))
+    assert mnemonic.max[0] == 5.
+    assert np.isnan(mnemonic.max[1])
+    assert mnemonic.max[2] == 2.
+
+
 def test_change_only_bounding_points():
     """Make sure we correctly add starting and ending time entries to
     a set of change-only data
@@ -101,6 +145,22 @@ def test_daily_stats():
     assert np.all(mnemonic.stdev == np.array([0., 0., 0., 0.]))
 
 
+def test_dates64():
+    """Test that the cached datetime64 dates follow changes to the data table"""
+    dates = np.array([datetime(2021, 12, 18, 12, 0, 0) + timedelta(hours=n) for n in range(10)])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = np.arange(10.)
+    mnemonic = ed.EdbMnemonic('SOMETHING', dates[0], dates[-1], tab, {}, {})
+
+    expected = dates.astype('datetime64[us]')
+    assert np.all(mnemonic.dates64 == expected)
+    assert mnemonic.dates64 is mnemonic.dates64
+
+    mnemonic.data = mnemonic.data[3:]
+    assert np.all(mnemonic.dates64 == expected[3:])
+
+
 def test_full_stats():
     """Test that the statistics calculated over the entire data set are
     correct
@@ -121,6 +181,28 @@ def test_full_stats():
     assert mnemonic.median_times[0] == datetime(2021, 12, 18, 7, 24, 30)
 
 
+def test_get_engdb_service(monkeypatch):
+    """Test that engineering database service instances are reused within a
+    thread, but never shared between threads
+    """
+    monkeypatch.setattr(ed, 'ENGDB_Service', lambda base_url: object())
+    ed.clear_engdb_services()
+    try:
+        service = ed.get_engdb_service('https://mast')
+        assert ed.get_engdb_service('https://mast') is service
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(ed.get_engdb_service('https://mast')))
+        thread.start()
+        thread.join()
+        assert other[0] is not service
+
+        ed.clear_engdb_services()
+        assert ed.get_engdb_service('https://mast') is not service
+    finally:
+        ed.clear_engdb_services()
+
+
 @pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
 def test_get_mnemonic():
     """Test the query of a single mnemonic."""
@@ -269,6 +351,22 @@ def test_multiplication():
     assert prod.info['tlmMnemonic'] == 'TEST_VOLTAGE * TEST_CURRENT'
 
 
+def test_sigma_clipped_bin_stats():
+    """Test that bins packed into a padded 2D array are sigma-clipped
+    independently of one another
+    """
+    values = np.array([1., 1., 1., 1., 1., 1., 1., 1., 1., 100., 5., 6., 7.])
+    binned = ed.pad_bins(values, [0, 10, 10, 13])
+    assert binned.shape == (3, 10)
+    assert np.all(np.isnan(binned[1]))
+
+    means, medians, stdevs = ed.sigma_clipped_bin_stats(binned, sigma=2)
+    assert np.allclose(means[[0, 2]], [1., 6.])
+    assert np.allclose(medians[[0, 2]], [1., 6.])
+    assert np.allclose(stdevs[[0, 2]], [0., np.std([5., 6., 7.])])
+    assert np.isnan(means[1])
+
+
 def test_timed_stats():
     """Break up data into chunks of a given duration"""
     dates = np.array([datetime(2021, 12, 18, 12, 0, 0) + timedelta(hours=n) for n in range(0, 75, 2)])
@@ -287,3 +385,23 @@ def test_timed_stats():
     mnemonic.mean_time_block = duration
     mnemonic.timed_stats(sigma=3)
     assert np.all(np.isclose(mnemonic.mean, np.append(np.arange(1.05, 6.06, 1), 96.)))
+
+
+def test_truncate():
+    """Remove data prior to a given time"""
+    dates = np.array([datetime(2021, 12, 18, 12, 0, 0) + timedelta(hours=n) for n in range(10)])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = np.arange(10.)
+    mnemonic = ed.EdbMnemonic('SOMETHING', dates[0], dates[-1], tab, {}, {})
+
+    cut = datetime(2021, 12, 18, 16, 30, 0)
+    mnemonic.truncate(cut)
+    assert np.all(mnemonic.values == np.arange(5., 10.))
+    assert mnemonic.requested_start_time == cut
+
+    # For change-only data, the point prior to the cut is retained
+    change_only = ed.EdbMnemonic('SOMETHING', dates[0], dates[-1], tab.copy(), {}, {})
+    change_only.change_only = True
+    change_only.truncate(cut)
+    assert np.all(change_only.values == np.arange(4., 10.))
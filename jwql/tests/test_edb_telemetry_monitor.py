@@ -17,9 +17,11 @@ Use
         pytest -s test_edb_telemetry_monitor.py
 """
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 import os
 import pytest
+import threading
 from types import SimpleNamespace
 
 from astropy.stats import sigma_clipped_stats
@@ -31,6 +33,7 @@ import datetime
 import numpy as np
 
 from jwql.database.database_interface import session
+from jwql.edb import engineering_database as ed
 from jwql.edb.engineering_database import EdbMnemonic
 from jwql.instrument_monitors.common_monitors import edb_telemetry_monitor as etm
 from jwql.instrument_monitors.common_monitors.edb_telemetry_monitor_utils import condition as cond
@@ -153,6 +156,42 @@ def test_conditions():
     assert condition_3.block_indexes == [0, 2, 3]
 
 
+def test_conditioned_cache(tmp_path):
+    """Test that filtered mnemonic data are written to and read back from the
+    on-disk cache, and that the cache file depends on the dependency conditions
+    """
+    inst = etm.EdbMnemonicMonitor()
+    inst.cache_dir = str(tmp_path)
+
+    start_time = datetime.datetime(2022, 2, 2)
+    end_time = datetime.datetime(2022, 2, 3)
+    mnemonic = {"name": "CURRENT", "dependency": [{"name": "VOLTAGE", "relation": ">", "threshold": 0.5}]}
+    cache_file = inst.conditioned_cache_file(mnemonic, start_time, end_time, "daily_means")
+
+    data = Table()
+    data["dates"] = np.array([start_time + datetime.timedelta(hours=2 * i) for i in range(6)])
+    data["euvalues"] = np.arange(6.)
+    meta = {'TlmMnemonics': [{'AllPoints': 1}]}
+    inst.write_conditioned_cache(cache_file, EdbMnemonic("CURRENT", start_time, end_time, data, meta, {},
+                                                         blocks=[0, 3, 6]))
+
+    cached = inst.read_conditioned_cache(cache_file, start_time, end_time)
+    assert list(cached.data["dates"]) == list(data["dates"])
+    assert np.all(cached.data["euvalues"] == data["euvalues"])
+    assert cached.data["euvalues"].dtype == np.float64
+    assert list(cached.blocks) == [0, 3, 6]
+
+    # Values that are exactly representable in single precision are stored that way
+    with np.load(cache_file) as saved:
+        assert saved["euvalues"].dtype == np.float32
+    assert cached.meta == meta
+
+    changed = deepcopy(mnemonic)
+    changed["dependency"][0]["threshold"] = 0.6
+    assert inst.conditioned_cache_file(changed, start_time, end_time, "daily_means") != cache_file
+    assert inst.conditioned_cache_file(mnemonic, start_time, end_time, "every_change") is None
+
+
 def test_find_all_changes():
     inst = etm.EdbMnemonicMonitor()
 
@@ -220,6 +259,47 @@ def test_key_check():
     assert etm_utils.check_key(d, 'key2') is None
 
 
+def test_mnemonic_cache(tmp_path):
+    """Test that EDB query results are written to and read back from the
+    on-disk cache, and that partial coverage does not return cached data
+    """
+    inst = etm.EdbMnemonicMonitor()
+    inst.cache_dir = str(tmp_path)
+
+    start_time = datetime.datetime(2022, 2, 2)
+    end_time = datetime.datetime(2022, 2, 3)
+    data = Table()
+    data["dates"] = np.array([start_time + datetime.timedelta(hours=2 * i) for i in range(12)])
+    data["euvalues"] = ['LOW', 'LOW', 'HIGH', 'HIGH', 'LOW', 'LOW', 'HIGH', 'HIGH', 'LOW', 'LOW', 'HIGH', 'HIGH']
+    meta = {'TlmMnemonics': [{'AllPoints': 1}]}
+    info = {'unit': 'none'}
+    inst.write_mnemonic_cache(EdbMnemonic("CURRENT", start_time, end_time, data, meta, info))
+
+    sub_start = datetime.datetime(2022, 2, 2, 4)
+    sub_end = datetime.datetime(2022, 2, 2, 10)
+    cached = inst.read_mnemonic_cache("CURRENT", sub_start, sub_end)
+    assert list(cached.data["dates"]) == list(data["dates"][2:6])
+    assert list(cached.data["euvalues"]) == ['HIGH', 'HIGH', 'LOW', 'LOW']
+    assert cached.meta == meta
+    assert cached.info == info
+
+    assert inst.read_mnemonic_cache("CURRENT", sub_start, datetime.datetime(2022, 2, 4)) is None
+    assert inst.read_mnemonic_cache("VOLTAGE", sub_start, sub_end) is None
+
+    # Change-only data with no changes inside the requested range still get the
+    # values in effect at the start and end times
+    data = Table()
+    data["dates"] = np.array([start_time, start_time + datetime.timedelta(hours=20)])
+    data["euvalues"] = np.array([1., 2.])
+    change_only_meta = {'TlmMnemonics': [{'AllPoints': 0}]}
+    inst.write_mnemonic_cache(EdbMnemonic("SWITCH", start_time, end_time, data, change_only_meta, info))
+
+    cached = inst.read_mnemonic_cache("SWITCH", sub_start, sub_end)
+    assert cached.change_only
+    assert list(cached.data["dates"]) == [sub_start, sub_end]
+    assert list(cached.data["euvalues"]) == [1., 1.]
+
+
 def test_multiple_conditions():
     """Test that filtering using multiple conditions is working as expected.
     """
@@ -311,6 +391,56 @@ def test_organize_every_change():
         assert np.all(val[2] == data[key][2])
 
 
+def test_prefetch_services(monkeypatch):
+    """Test that background queries of the EDB do not share an engineering database
+    service instance with each other or with queries made by the main thread
+    """
+    services = []
+
+    class FakeService():
+        def __init__(self, base_url):
+            self.thread = threading.get_ident()
+            services.append(self)
+
+        def get_meta(self, mnemonic_identifier):
+            assert threading.get_ident() == self.thread
+            return {'TlmMnemonics': [{'AllPoints': 1}]}
+
+        def get_values(self, mnemonic_identifier, start_time, end_time, include_obstime=True,
+                       include_bracket_values=False):
+            assert threading.get_ident() == self.thread
+            return []
+
+    monkeypatch.setattr(ed, 'ENGDB_Service', FakeService)
+    monkeypatch.setattr(ed, 'get_mast_base_url', lambda: 'https://mast')
+    monkeypatch.setattr(ed, 'get_mnemonic_info', lambda mnemonic_identifier: {})
+    ed.clear_engdb_services()
+
+    inst = etm.EdbMnemonicMonitor()
+    inst.query_duration = datetime.timedelta(days=1)
+    inst.query_cadence = datetime.timedelta(days=1)
+    inst._prefetch_executor = ThreadPoolExecutor(max_workers=4)
+    start_time = datetime.datetime(2022, 2, 2)
+    starting_times = [start_time, start_time + datetime.timedelta(days=1)]
+    ending_times = [start_time + datetime.timedelta(days=1), start_time + datetime.timedelta(days=2)]
+    mnemonic = {"name": "CURRENT", "plot_data": "nominal",
+                "dependency": [{"name": "VOLTAGE", "relation": ">", "threshold": 0.5},
+                               {"name": "SWITCH", "relation": "=", "threshold": "ON"}]}
+    try:
+        inst.submit_prefetch(mnemonic, starting_times, ending_times)
+        ed.get_mnemonic("TEMPERATURE", starting_times[0], ending_times[-1])
+        for name in ["CURRENT", "VOLTAGE", "SWITCH"]:
+            inst.prefetch_mnemonic(name, starting_times[0], ending_times[-1])
+            assert name in inst.query_results
+    finally:
+        inst._prefetch_executor.shutdown()
+        ed.clear_engdb_services()
+
+    # Each thread created its own service, and only ever used that one
+    assert len(services) == len(set(service.thread for service in services))
+    assert threading.get_ident() in [service.thread for service in services]
+
+
 def test_remove_outer_points():
     """Test that points outside the requested time are removed for change-only data
     """
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+
+"""Tests for the ``run_pipeline`` module.
+
+Use
+---
+
+    These tests can be run via the command line (omit the ``-s`` to
+    suppress verbose output to stdout):
+    ::
+
+        pytest -s test_run_pipeline.py
+"""
+
+import os
+from types import SimpleNamespace
+
+from jwql.instrument_monitors.pipeline_tools import get_pipeline_steps
+from jwql.shared_tasks import run_pipeline
+
+
+class FakeModel():
+    """Minimal stand-in for a jwst datamodel that records saved files"""
+    def __init__(self):
+        self.meta = SimpleNamespace(dither=SimpleNamespace(dither_points=1))
+
+    def save(self, filename):
+        with open(filename, 'w') as fobj:
+            fobj.write('saved')
+
+
+class FakeStep():
+    """Minimal stand-in for a jwst pipeline step"""
+    def __init__(self, name):
+        self.name = name
+
+    def call(self, model, **kwargs):
+        if self.name == 'rate':
+            return FakeModel(), FakeModel()
+        return model
+
+
+def test_run_pipe_all_outputs(tmp_path, monkeypatch):
+    """Make sure that requesting "all" outputs saves the output of every
+    pipeline step for the instrument
+    """
+    instrument = 'nircam'
+    short_name = 'jw02733001001_02101_00001_nrcb1'
+    input_file = tmp_path / '{}_uncal.fits'.format(short_name)
+    input_file.write_text('uncal')
+
+    steps = get_pipeline_steps(instrument)
+    monkeypatch.setattr(run_pipeline, 'PIPELINE_STEP_MAPPING', {step: FakeStep(step) for step in steps})
+    monkeypatch.setattr(run_pipeline.datamodels, 'open', lambda filename: FakeModel())
+    monkeypatch.setattr(run_pipeline, 'set_permissions', lambda filename: None)
+
+    run_pipeline.run_pipe(str(input_file), short_name, str(tmp_path), instrument, ['all'])
+
+    for step in steps:
+        assert os.path.isfile(tmp_path / '{}_{}.fits'.format(short_name, step))
+
+    with open(tmp_path / '{}_status.txt'.format(short_name)) as status_file:
+        assert status_file.read().endswith('SUCCEEDED')
@@ -248,6 +248,10 @@ DETECTOR_PER_INSTRUMENT = {
 # go from this starting time to the monitor run time, unless otherwise requested.
 EDB_DEFAULT_PLOT_RANGE = 14  # days.
 
+# Maximum number of points per data series in EDB monitor telemetry plots. Longer
+# series are downsampled before being embedded in the plots.
+EDB_MAX_PLOT_POINTS = 2000
+
 EXP_TYPE_PER_INSTRUMENT = {
     "fgs": ["FGS_FOCUS", "FGS_IMAGE", "FGS_INTFLAT", "FGS_SKYFLAT", "FGS_DARK"],
     "miri": [
@@ -27,6 +27,7 @@ References
     - JWST TR JWST-STScI-004800, SM-12
  """
 
+import fcntl
 import getpass
 import glob
 import itertools
@@ -56,6 +57,10 @@ from jwql.utils.constants import FILE_AC_CAR_ID_LEN, FILE_AC_O_ID_LEN, FILE_ACT_
     JWST_INSTRUMENT_NAMES_SHORTHAND, ON_GITHUB_ACTIONS
 __location__ = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
+# ioctl request code used to create a copy-on-write clone of a file on filesystems
+# that support it (e.g. Btrfs, XFS)
+FICLONE = 0x40049409
+
 
 def _validate_config(config_file_dict):
     """Check that the config.json file contains all the needed entries with
@@ -264,6 +269,41 @@ if not ON_GITHUB_ACTIONS:
     FILESYSTEM = get_config()['filesystem']
 
 
+def _fast_copy(src, dst):
+    """Copy a file, including its metadata, avoiding copying the data through user
+    space where possible. First try to create a copy-on-write clone of the file,
+    which is nearly instantaneous regardless of file size. If that is not supported,
+    copy the data within the kernel using ``os.copy_file_range``. Fall back to
+    ``shutil.copyfile`` if neither is available.
+
+    Parameters
+    ----------
+    src : str
+        File to be copied
+
+    dst : str
+        Name of the new file
+    """
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except OSError:
+                if not hasattr(os, 'copy_file_range'):
+                    raise
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    num = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if num == 0:
+                        break
+                    copied += num
+    except OSError:
+        # e.g. copy_file_range is not supported between these filesystems
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
 def copy_files(files, out_dir):
     """Copy a given file to a given directory. Only try to copy the file
     if it is not already present in the output directory.
@@ -294,7 +334,7 @@ def copy_files(files, out_dir):
             success.append(input_new_path)
         else:
             try:
-                shutil.copy2(input_file, out_dir)
+                _fast_copy(input_file, input_new_path)
                 success.append(input_new_path)
                 permissions.set_permissions(input_new_path)
             except Exception:
@@ -293,6 +293,7 @@ class FileSearchForm(forms.Form):
 
         # Get the cleaned search data
         search = self.cleaned_data['search']
+        filesystem = get_config()['filesystem']
 
         # Make sure the search is either a proposal or fileroot
         if search.isnumeric() and 1 < int(search) < 99999:
@@ -308,9 +309,9 @@ class FileSearchForm(forms.Form):
             # See if there are any matching proposals and, if so, what
             # instrument they are for
             proposal_string = '{:05d}'.format(int(search))
-            search_string_public = os.path.join(get_config()['filesystem'], 'public', 'jw{}'.format(proposal_string),
+            search_string_public = os.path.join(filesystem, 'public', 'jw{}'.format(proposal_string),
                                                 '*', '*{}*.fits'.format(proposal_string))
-            search_string_proprietary = os.path.join(get_config()['filesystem'], 'proprietary', 'jw{}'.format(proposal_string),
+            search_string_proprietary = os.path.join(filesystem, 'proprietary', 'jw{}'.format(proposal_string),
                                                      '*', '*{}*.fits'.format(proposal_string))
             all_files = glob.glob(search_string_public)
             all_files.extend(glob.glob(search_string_proprietary))
@@ -330,13 +331,14 @@ class FileSearchForm(forms.Form):
                     if any(map(filename.__contains__, GUIDER_FILENAME_TYPE)):
                         continue
                     else:
-                        instrument = filename_parser(file)['instrument']
-                        observation = filename_parser(file)['observation']
+                        # Parse each filename only once
+                        file_info = filename_parser(filename)
+                        instrument = file_info['instrument']
                         all_instruments.append(instrument)
-                        all_observations[instrument].append(observation)
+                        all_observations[instrument].append(file_info['observation'])
 
                 # sort lists so first observation is available when link is clicked.
-                for instrument in all_instruments:
+                for instrument in all_observations:
                     all_observations[instrument].sort()
 
                 if len(set(all_instruments)) > 1:
@@ -353,8 +355,8 @@ class FileSearchForm(forms.Form):
         # If they searched for a fileroot...
         elif self.search_type == 'fileroot':
             # See if there are any matching fileroots and, if so, what instrument they are for
-            search_string_public = os.path.join(get_config()['filesystem'], 'public', search[:7], search[:13], '{}*.fits'.format(search))
-            search_string_proprietary = os.path.join(get_config()['filesystem'], 'proprietary', search[:7], search[:13], '{}*.fits'.format(search))
+            search_string_public = os.path.join(filesystem, 'public', search[:7], search[:13], '{}*.fits'.format(search))
+            search_string_proprietary = os.path.join(filesystem, 'proprietary', search[:7], search[:13], '{}*.fits'.format(search))
             all_files = glob.glob(search_string_public)
             all_files.extend(glob.glob(search_string_proprietary))
 